@@ -0,0 +1,106 @@
+from array import array
+from frequency import FrequencyTable
+
+
+class MaxAggregate:
+    """
+    Keeps running aggregates of a stream of items: how many were seen
+    and which ones share the greatest key, with their occurrences.
+    """
+    def __init__(self, key=None):
+        """
+        :param key: Converts an item into the value being maximized. If empty, the item itself is used.
+        """
+        self.key = key
+        self.count = 0
+        self.maximum = None
+        self.items = FrequencyTable()
+
+    def add(self, item):
+        """
+        Registers an item, replacing the current maximum items if it is greater.
+        """
+        self.count += 1
+        value = self.key(item) if self.key else item
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+            self.items = FrequencyTable()
+            self.items.add(item)
+        elif value == self.maximum:
+            self.items.add(item)
+
+    def add_all(self, items):
+        """
+        Registers all the given items. Without a key, a list or array of items is aggregated at C speed.
+        """
+        if self.key is None and isinstance(items, (list, array)):
+            if items:
+                maximum = max(items)
+                self.add_group(maximum, items.count(maximum), len(items))
+            return
+
+        for item in items:
+            self.add(item)
+
+    def add_group(self, maximum, occurrences:int, count:int):
+        """
+        Registers a group of items at once from its own aggregates.
+        :param maximum: The greatest item of the group.
+        :param occurrences: How many times the greatest item occurs in the group.
+        :param count: How many items the group has.
+        """
+        self.count += count
+        value = self.key(maximum) if self.key else maximum
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+            self.items = FrequencyTable()
+            self.items.add(maximum, occurrences)
+        elif value == self.maximum:
+            self.items.add(maximum, occurrences)
+
+    def merge(self, other:"MaxAggregate"):
+        """
+        Registers all the items aggregated by another MaxAggregate with the same key.
+        """
+        self.count += other.count
+        if other.maximum is None:
+            return
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+            self.items = FrequencyTable()
+        if other.maximum == self.maximum:
+            self.items.add_counts(other.items.counts)
+
+
+class LengthHistogram:
+    """
+    Counts the items of each length, keeping a single counter per distinct length instead of the items.
+    """
+    def __init__(self, key=len):
+        """
+        :param key: Gets the length of an item.
+        """
+        self.key = key
+        self.lengths = FrequencyTable()
+
+    @property
+    def count(self) -> int:
+        return self.lengths.total
+
+    def add(self, item):
+        self.lengths.add(self.key(item))
+
+    def add_all(self, items):
+        self.lengths.add_all(map(self.key, items))
+
+    def merge(self, other:"LengthHistogram"):
+        """
+        Registers all the lengths counted by another LengthHistogram.
+        """
+        self.lengths.add_counts(other.lengths.counts)
+
+    def sorted_by_length(self) -> list[tuple[int, int]]:
+        """
+        Gets the (length, count) pairs, from the shortest to the longest length.
+        """
+        return sorted(self.lengths.counts.items())
@@ -0,0 +1,142 @@
+from array import array
+from collections import Counter
+from itertools import groupby, repeat
+from operator import rshift
+
+
+def count_values(values) -> Counter:
+    """
+    Builds the histogram of the values, counting them at C speed.
+    """
+    return Counter(values)
+
+
+def count_range(values, minimum:int, maximum:int) -> array:
+    """
+    Builds the histogram of values in a narrow range as an array with one 64-bit counter per value of the range,
+    so it uses no more memory than the values themselves, however many of them are distinct.
+    :param minimum: The smallest of the values.
+    :param maximum: The greatest of the values.
+    """
+    histogram = array("q", bytes(8 * (maximum - minimum + 1)))
+    for value in values:
+        histogram[value - minimum] += 1
+    return histogram
+
+
+def iter_counts(histogram:array, minimum:int):
+    """
+    Iterates over the (value, count) pairs of a histogram built by count_range, in natural order,
+    skipping the values of the range that do not occur.
+    """
+    for offset, count in enumerate(histogram):
+        if count:
+            yield minimum + offset, count
+
+
+def counting_sort(histogram:array, minimum:int):
+    """
+    Iterates over the values of a histogram built by count_range in natural order.
+    :param minimum: The smallest value of the histogram.
+    """
+    for value, count in iter_counts(histogram, minimum):
+        yield from repeat(value, count)
+
+
+def radix_sort(values:array, minimum:int, maximum:int) -> array:
+    """
+    Sorts 64-bit values with a least significant digit radix sort on 8-bit digits.
+    The values are offset by the minimum, so only the digits needed for the range are visited.
+    Its passes run in Python, so it is usually slower than the C timsort of sorted() and is only used when requested.
+    :return: A new array with the sorted values.
+    """
+    passes = max(1, ((maximum - minimum).bit_length() + 7) // 8)
+    for shift in range(0, passes * 8, 8):
+        buckets = [array(values.typecode) for _ in range(256)]
+        appends = [bucket.append for bucket in buckets]
+        for value in values:
+            appends[((value - minimum) >> shift) & 255](value)
+
+        values = array(values.typecode)
+        for bucket in buckets:
+            values.extend(bucket)
+    return values
+
+
+def is_narrow_range(count:int, minimum:int, maximum:int) -> bool:
+    """
+    Checks whether a range of values is small enough for a counting sort to pay off:
+    its histogram has one counter per value of the range, so the range must not be wider than the values.
+    """
+    return maximum - minimum < max(count, 1 << 16)
+
+
+def select_ranks(sorted_values, ranks:list[int]) -> list:
+    """
+    Picks the values at some positions of an iterable in natural order, in a single pass.
+    :param ranks: The 0-based positions of the values, in increasing order.
+    """
+    selected = []
+    pending = iter(ranks)
+    rank = next(pending, None)
+    for position, value in enumerate(sorted_values):
+        while rank == position:
+            selected.append(value)
+            rank = next(pending, None)
+        if rank is None:
+            break
+    return selected
+
+
+def unique_sorted(sorted_values):
+    """
+    Iterates over the values of an iterable in natural order, skipping the repeated ones.
+    """
+    return (value for value, _ in groupby(sorted_values))
+
+
+def select_values(values:array, ranks:list[int], minimum:int, maximum:int, bucket_bits:int = 12) -> list[int]:
+    """
+    Picks the values at some positions of their natural order without sorting all of them.
+    The values are counted in buckets of their high bits at C speed, then only the values
+    of the buckets holding the ranks are gathered and sorted.
+    :param ranks: The 0-based positions of the values, in increasing order.
+    :param minimum: The smallest of the values.
+    :param maximum: The greatest of the values.
+    :param bucket_bits: The amount of high bits of the range that pick the bucket of each value.
+    """
+    shift = max((maximum - minimum).bit_length() - bucket_bits, 0)
+    inner_ranks = [rank for rank in ranks if 0 < rank < len(values) - 1]
+    buckets = count_values(map(rshift, values, repeat(shift))) if inner_ranks else {}
+
+    selected = {0: minimum, len(values) - 1: maximum}
+    for bucket, positions in walk_histogram(sorted(buckets.items()), inner_ranks).items():
+        low = bucket << shift
+        if not shift:
+            selected.update((rank, low) for rank, _ in positions)
+            continue
+        high = low + (1 << shift)
+        candidates = sorted(filter(high.__gt__, filter(low.__le__, values)))
+        selected.update((rank, candidates[position]) for rank, position in positions)
+    return [selected[rank] for rank in ranks]
+
+
+def walk_histogram(counts, ranks:list[int]) -> dict:
+    """
+    Finds which values of a histogram hold some positions of the natural order, without expanding it.
+    :param counts: The (value, count) pairs of the histogram, in natural order of the values.
+    :param ranks: The 0-based positions, in increasing order.
+    :return: The (rank, position within the value's occurrences) pairs of each value holding some rank.
+    """
+    found = {}
+    pending = iter(ranks)
+    rank = next(pending, None)
+    position = 0
+    for value, size in counts:
+        if rank is None:
+            break
+        while rank is not None and rank < position + size:
+            found.setdefault(value, []).append((rank, rank - position))
+            rank = next(pending, None)
+        position += size
+    return found
@@ -0,0 +1,95 @@
+"""
+In-process API of the sorting tool.
+
+Runs the processors without parsing command line arguments, so many sorts can run in one warm process:
+
+    from api import sort_items
+    result = sort_items(["3 1", "2"], ProcessorTypes.integer, ProcessorOutputs.sorted)
+"""
+import io
+import sys
+from batch import BatchRunner
+from options import ProcessorOptions
+from processors import Processor, ProcessorFactory
+from validation import ProcessorOutputs, ProcessorTypes
+from writers import OutputSink
+
+
+def validate_types(datatype:str, output:str):
+    """
+    Checks the types of a sort without creating a processor.
+    :raises ValueError: If the datatype or the output is not valid.
+    """
+    if output not in ProcessorOutputs.valid_types:
+        raise ValueError(f"\"{output}\" is not a valid sorting type.")
+    if datatype not in ProcessorTypes.valid_types:
+        raise ValueError(f"\"{datatype}\" is not a valid data type.")
+
+
+def create_processor(datatype:str, output:str, input_path:str = None, output_path:str = None,
+                     options:ProcessorOptions = None) -> Processor:
+    """
+    Creates a processor, failing for invalid types instead of returning None.
+    :param datatype: Must be one of the ProcessorTypes.
+    :param output: Must be one of the ProcessorOutputs.
+    :param input_path: A file path to read the input from. If empty, the standard input is used.
+    :param output_path: A file path to write the output to. If empty, the standard output is used.
+    :param options: Optional settings that tune how the data is loaded and sorted.
+    :raises ValueError: If the datatype or the output is not valid.
+    """
+    validate_types(datatype, output)
+    return ProcessorFactory().create(datatype, output, input_path, output_path, options)
+
+
+def write_items(lines, stream, datatype:str = ProcessorTypes.word, output:str = ProcessorOutputs.sorted,
+                options:ProcessorOptions = None, diagnostics = None):
+    """
+    Processes lines of input that are already in memory and streams the result to a text stream.
+    :param lines: An iterable of lines of input, each one with one line, or with words or numbers separated by spaces.
+    :param stream: The text stream the result is written to, in pieces, as it is produced.
+    :param diagnostics: The text stream for the messages about skipped input. If not defined, the standard error is used.
+    :raises ValueError: If the output is binary and the stream has no byte stream under it, like an io.StringIO.
+    """
+    processor = create_processor(datatype, output, options=options)
+    if processor.binary_output and not OutputSink.accepts_bytes(stream):
+        processor.close()
+        raise ValueError("The binary output formats need a stream that accepts bytes, like sys.stdout.")
+    processor.output_stream = stream
+    processor.diagnostics = diagnostics or sys.stderr
+    processor.load_lines(lines)
+    processor.write_data()
+
+
+def sort_items(lines, datatype:str = ProcessorTypes.word, output:str = ProcessorOutputs.sorted,
+               options:ProcessorOptions = None, diagnostics = None) -> str:
+    """
+    Processes lines of input that are already in memory and returns the result as it would be printed.
+    The parameters are the same of write_items.
+    """
+    stream = io.StringIO()
+    write_items(lines, stream, datatype, output, options, diagnostics)
+    return stream.getvalue()
+
+
+def sort_file(input_path:str = None, output_path:str = None, datatype:str = ProcessorTypes.word,
+              output:str = ProcessorOutputs.sorted, options:ProcessorOptions = None):
+    """
+    Processes a file like the command line does: from the input_path, or the standard input if empty,
+    to the output_path, or the standard output if empty.
+    """
+    processor = create_processor(datatype, output, input_path, output_path, options)
+    processor.load_data()
+    processor.write_data()
+
+
+def sort_files(input_paths:list[str], datatype:str = ProcessorTypes.word, output:str = ProcessorOutputs.sorted,
+               options:ProcessorOptions = None, output_directory:str = None, output_suffix:str = ".sorted",
+               combined_path:str = None):
+    """
+    Processes many files concurrently, each one to its own output file, like the command line -inputFiles does.
+    The parameters after options are the same of BatchRunner.
+    :raises ValueError: If the datatype or the output is not valid.
+    """
+    validate_types(datatype, output)
+    runner = BatchRunner(datatype, output, options, output_directory, output_suffix, combined_path)
+    runner.run(input_paths)
@@ -1,9 +1,15 @@
-from validation import ProcessorOutputs, ProcessorTypes
+from options import ProcessorOptions
+from validation import ProcessorAlgorithms, ProcessorEngines, ProcessorFormats, ProcessorOutputs, ProcessorTypes
+import glob
+import re
 import sys
 import os
 
 
 class Argument:
+    takes_value = True
+    takes_many = False
+
     def __init__(self, key:str, value:str, valid_types:list[str], error_message:str):
         self.key = key
         self.value = value
@@ -27,33 +33,228 @@ class FileArgument(Argument):
         return True
 
 
+class TextArgument(Argument):
+    def __init__(self, key:str, value:str, error_message:str):
+        super().__init__(key, value, [], error_message)
+
+    def is_valid(self, option_value):
+        return bool(option_value)
+
+
+class MultiFileArgument(Argument):
+    takes_many = True
+
+    def __init__(self, key:str, error_message:str):
+        super().__init__(key, [], [], error_message)
+
+    @staticmethod
+    def expand(patterns:list[str]) -> list[str]:
+        """
+        Expands the file paths and glob patterns into the paths of the existent files, keeping their order.
+        """
+        paths = []
+        for pattern in patterns:
+            paths.extend(path for path in sorted(glob.glob(pattern)) if os.path.isfile(path))
+        return paths
+
+    def is_valid(self, option_values):
+        return bool(self.expand(option_values))
+
+    def get_paths(self):
+        return self.expand(self.value)
+
+
+class FlagArgument(Argument):
+    takes_value = False
+
+    def __init__(self, key:str):
+        super().__init__(key, False, [], "")
+
+
+class SizeArgument(Argument):
+    units = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    size_pattern = re.compile(r"(\d+)([KMG]?)B?", re.IGNORECASE)
+
+    def __init__(self, key:str, error_message:str):
+        super().__init__(key, None, [], error_message)
+
+    def is_valid(self, option_value):
+        match = self.size_pattern.fullmatch(option_value)
+        return match is not None and int(match.group(1)) > 0
+
+    def get_bytes(self):
+        """
+        Converts the size value (e.g. 512M) into an amount of bytes.
+        :return: The amount of bytes or None if no size was defined.
+        """
+        if not self.value:
+            return None
+        number, unit = self.size_pattern.fullmatch(self.value).groups()
+        return int(number) * self.units[unit.upper()]
+
+
+class IntegerArgument(Argument):
+    def __init__(self, key:str, value:int, error_message:str):
+        super().__init__(key, value, [], error_message)
+
+    def is_valid(self, option_value):
+        return option_value.isdigit() and int(option_value) > 0
+
+    def get_number(self):
+        return int(self.value)
+
+
 class ArgumentParser:
-    datatype_option = Argument(
-        "-dataType",
-        ProcessorTypes.word,
-        ProcessorTypes.valid_types,
-        "No data type defined!")
-    sorting_option = Argument(
-        "-sortingType",
-        ProcessorOutputs.sorted,
-        ProcessorOutputs.valid_types,
-        "No sorting type defined!")
-    input_option = FileArgument(
-        "-inputFile",
-        "No input file path defined!",
-        True)
-    output_option = FileArgument(
-        "-outputFile",
-        "No output file path defined!",
-        False)
-
-    def __init__(self):
-        self.arguments = sys.argv[1:] if len(sys.argv) > 1 else None
+    # Environment variables that enable the profiling without changing the command line.
+    profile_variable = "SORTING_TOOL_PROFILE"
+    cprofile_variable = "SORTING_TOOL_CPROFILE"
+
+    def __init__(self, arguments:list[str] = None):
+        """
+        :param arguments: The command line arguments to be parsed. If not defined, the ones of sys.argv are used.
+        """
+        self.arguments = sys.argv[1:] if arguments is None else arguments
+        self.datatype_option = Argument(
+            "-dataType",
+            ProcessorTypes.word,
+            ProcessorTypes.valid_types,
+            "No data type defined!")
+        self.sorting_option = Argument(
+            "-sortingType",
+            ProcessorOutputs.sorted,
+            ProcessorOutputs.valid_types,
+            "No sorting type defined!")
+        self.input_option = FileArgument(
+            "-inputFile",
+            "No input file path defined!",
+            True)
+        self.output_option = FileArgument(
+            "-outputFile",
+            "No output file path defined!",
+            False)
+        self.memory_option = SizeArgument(
+            "-memoryLimit",
+            "No memory limit defined!")
+        self.temp_directory_option = FileArgument(
+            "-tempDir",
+            "No temporary directory defined!",
+            False)
+        self.engine_option = Argument(
+            "-engine",
+            ProcessorEngines.python,
+            ProcessorEngines.valid_types,
+            "No engine defined!")
+        self.algorithm_option = Argument(
+            "-algorithm",
+            ProcessorAlgorithms.auto,
+            ProcessorAlgorithms.valid_types,
+            "No sorting algorithm defined!")
+        self.workers_option = IntegerArgument(
+            "-workers",
+            1,
+            "No amount of workers defined!")
+        self.limit_option = IntegerArgument(
+            "-limit",
+            10,
+            "No limit defined!")
+        self.profile_option = FlagArgument("-profile")
+        self.input_files_option = MultiFileArgument(
+            "-inputFiles",
+            "No existent input files defined!")
+        self.output_directory_option = FileArgument(
+            "-outputDir",
+            "No output directory defined!",
+            False)
+        self.output_suffix_option = TextArgument(
+            "-outputSuffix",
+            ".sorted",
+            "No output suffix defined!")
+        self.combined_option = FileArgument(
+            "-combinedFile",
+            "No combined output file path defined!",
+            False)
+        self.pipeline_option = IntegerArgument(
+            "-pipelineDepth",
+            0,
+            "No pipeline depth defined!")
+        self.batch_size_option = SizeArgument(
+            "-batchSize",
+            "No batch size defined!")
+        self.cache_directory_option = FileArgument(
+            "-cacheDir",
+            "No cache directory defined!",
+            False)
+        self.cache_size_option = SizeArgument(
+            "-cacheSize",
+            "No cache size defined!")
+        self.cache_bypass_option = FlagArgument("-noCache")
+        self.cache_stats_option = FlagArgument("-cacheStats")
+        self.index_option = FileArgument(
+            "-indexFile",
+            "No index file path defined!",
+            False)
+        self.input_format_option = Argument(
+            "-inputFormat",
+            ProcessorFormats.text,
+            ProcessorFormats.valid_types,
+            "No input format defined!")
+        self.output_format_option = Argument(
+            "-outputFormat",
+            ProcessorFormats.text,
+            ProcessorFormats.valid_types,
+            "No output format defined!")
+        self.approx_option = FlagArgument("-approx")
+        self.approx_memory_option = SizeArgument(
+            "-approxMemory",
+            "No approximation memory defined!")
+        self.sketch_size_option = IntegerArgument(
+            "-sketchSize",
+            200,
+            "No sketch size defined!")
+        self.unique_option = FlagArgument("-unique")
+        self.serve_option = FlagArgument("--serve")
+        self.client_option = FlagArgument("--client")
+        self.socket_option = TextArgument(
+            "-socket",
+            None,
+            "No socket path defined!")
+        self.queue_size_option = IntegerArgument(
+            "-queueSize",
+            64,
+            "No queue size defined!")
         self.options = {
             self.datatype_option.key : self.datatype_option,
             self.sorting_option.key : self.sorting_option,
             self.input_option.key : self.input_option,
             self.output_option.key : self.output_option,
+            self.memory_option.key : self.memory_option,
+            self.temp_directory_option.key : self.temp_directory_option,
+            self.engine_option.key : self.engine_option,
+            self.algorithm_option.key : self.algorithm_option,
+            self.workers_option.key : self.workers_option,
+            self.limit_option.key : self.limit_option,
+            self.profile_option.key : self.profile_option,
+            self.input_files_option.key : self.input_files_option,
+            self.output_directory_option.key : self.output_directory_option,
+            self.output_suffix_option.key : self.output_suffix_option,
+            self.combined_option.key : self.combined_option,
+            self.pipeline_option.key : self.pipeline_option,
+            self.batch_size_option.key : self.batch_size_option,
+            self.cache_directory_option.key : self.cache_directory_option,
+            self.cache_size_option.key : self.cache_size_option,
+            self.cache_bypass_option.key : self.cache_bypass_option,
+            self.cache_stats_option.key : self.cache_stats_option,
+            self.index_option.key : self.index_option,
+            self.input_format_option.key : self.input_format_option,
+            self.output_format_option.key : self.output_format_option,
+            self.approx_option.key : self.approx_option,
+            self.approx_memory_option.key : self.approx_memory_option,
+            self.sketch_size_option.key : self.sketch_size_option,
+            self.unique_option.key : self.unique_option,
+            self.serve_option.key : self.serve_option,
+            self.client_option.key : self.client_option,
+            self.socket_option.key : self.socket_option,
+            self.queue_size_option.key : self.queue_size_option,
         }
 
     def process(self):
@@ -67,7 +268,15 @@ class ArgumentParser:
                 print(f"\"{argument}\" is not a valid parameter. It will be skipped.")
 
     def set_option(self, current_index, option):
+        if not self.options[option].takes_value:
+            self.options[option].value = True
+            return
+
         option_value_index = current_index + 1
+        if self.options[option].takes_many:
+            self.set_many_values(option_value_index, option)
+            return
+
         if option_value_index >= len(self.arguments):
             self.options[option].value = None
             print(self.options[option].error_message)
@@ -80,5 +289,72 @@ class ArgumentParser:
 
         self.options[option].value = option_value
 
+    def set_many_values(self, first_index, option):
+        """
+        Sets all the values that follow an option, up to the next parameter.
+        """
+        option_values = []
+        for argument in self.arguments[first_index:]:
+            if argument.startswith("-"):
+                break
+            option_values.append(argument)
+
+        if not self.options[option].is_valid(option_values):
+            print(self.options[option].error_message)
+            return
+
+        self.options[option].value = option_values
+
     def get_options_values(self):
-        return self.datatype_option.value, self.sorting_option.value, self.input_option.value, self.output_option.value
\ No newline at end of file
+        return self.datatype_option.value, self.sorting_option.value, self.input_option.value, self.output_option.value
+
+    def get_given_parameters(self):
+        """
+        Gets the valid parameters present in the command line.
+        """
+        return [key for key in self.options if key in self.arguments]
+
+    def get_processor_options(self):
+        return ProcessorOptions(
+            memory_limit=self.memory_option.get_bytes(),
+            engine=self.engine_option.value,
+            algorithm=self.algorithm_option.value,
+            workers=self.workers_option.get_number(),
+            limit=self.limit_option.get_number(),
+            profile=os.environ.get(self.profile_variable) or ("stderr" if self.profile_option.value else None),
+            cprofile_path=os.environ.get(self.cprofile_variable),
+            pipeline_depth=self.pipeline_option.get_number(),
+            batch_size=self.batch_size_option.get_bytes(),
+            cache_directory=self.cache_directory_option.value,
+            cache_size=self.cache_size_option.get_bytes(),
+            cache_bypass=self.cache_bypass_option.value,
+            index_path=self.index_option.value,
+            input_format=self.input_format_option.value,
+            output_format=self.output_format_option.value,
+            approx=self.approx_option.value,
+            approx_memory=self.approx_memory_option.get_bytes(),
+            sketch_size=self.sketch_size_option.get_number(),
+            unique=self.unique_option.value,
+            temp_directory=self.temp_directory_option.value or None)
+
+    def get_batch_values(self):
+        """
+        Gets the settings of the batch mode: the input file paths (empty if not in batch mode),
+        the output directory, the output suffix and the combined output file path.
+        """
+        return (self.input_files_option.get_paths(), self.output_directory_option.value,
+                self.output_suffix_option.value, self.combined_option.value)
+
+    def get_cache_stats_value(self):
+        """
+        Gets if the statistics of the cache should be shown instead of processing any input.
+        """
+        return self.cache_stats_option.value
+
+    def get_server_values(self):
+        """
+        Gets the settings of the daemon mode: if the daemon or the client should run,
+        the socket path and the size of the job queue.
+        """
+        return (self.serve_option.value, self.client_option.value,
+                self.socket_option.value, self.queue_size_option.get_number())
@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from io import StringIO
+from external import SpilledRun
+from options import ProcessorOptions
+from processors import ProcessorFactory
+
+
+def process_file(datatype:str, output_type:str, options:ProcessorOptions, input_path:str, output_path:str,
+                 export:bool):
+    """
+    Processes one file of a batch in a worker process, writing its result to the output_path.
+    :param export: If the state of the processor should be exported to build the combined result.
+    :return: The exported state of the processor (or None) and the diagnostic messages it produced.
+    """
+    processor = ProcessorFactory().create(datatype, output_type, input_path, output_path, options)
+    processor.diagnostics = StringIO()
+    chunk = None
+    try:
+        processor.load_data()
+        # The sorted items are handed over in a file, so the parent merges them from disk.
+        chunk = processor.export_chunk(spill=True) if export else None
+        if isinstance(chunk, SpilledRun):
+            processor.use_exported_run(chunk)
+        processor.write_data()
+    except BaseException:
+        if isinstance(chunk, SpilledRun):
+            chunk.discard()
+        raise
+    finally:
+        processor.close()
+    return chunk, processor.diagnostics.getvalue()
+
+
+class BatchRunner:
+    """
+    Processes many input files concurrently, each one to its own output file,
+    and optionally combines all of them into a single result.
+    """
+    def __init__(self, datatype:str, output_type:str, options:ProcessorOptions = None,
+                 output_directory:str = None, output_suffix:str = ".sorted", combined_path:str = None):
+        """
+        :param datatype: Must be one of the ProcessorTypes.
+        :param output_type: Must be one of the ProcessorOutputs.
+        :param options: The processor options. Its workers are the amount of files processed at once.
+        :param output_directory: The directory of the output files. If empty, each one is next to its input file.
+        :param output_suffix: Appended to the name of each input file to name its output file.
+        :param combined_path: If defined, the result of all the files together is written to this file path.
+        """
+        self.datatype = datatype
+        self.output_type = output_type
+        self.options = options or ProcessorOptions()
+        self.output_directory = output_directory
+        self.output_suffix = output_suffix
+        self.combined_path = combined_path
+
+    def get_output_path(self, input_path:str) -> str:
+        directory = self.output_directory or os.path.dirname(input_path)
+        return os.path.join(directory, os.path.basename(input_path) + self.output_suffix)
+
+    def run(self, input_paths:list[str]):
+        """
+        Processes the files, writing their diagnostic messages to the console in the order of the input_paths.
+        A file that fails is reported and left out of the combined result.
+        """
+        if self.output_directory:
+            os.makedirs(self.output_directory, exist_ok=True)
+
+        file_options = copy(self.options)
+        file_options.workers = 1
+        export = bool(self.combined_path)
+        combined = None
+        if export:
+            # A cached result has no items to export for the combined result.
+            file_options.cache_directory = None
+            combined = ProcessorFactory().create(
+                self.datatype, self.output_type, None, self.combined_path, file_options)
+            combined.prepare_import(spilled=True)
+
+        with ProcessPoolExecutor(self.options.workers) as pool:
+            futures = [pool.submit(process_file, self.datatype, self.output_type, file_options,
+                                   input_path, self.get_output_path(input_path), export)
+                       for input_path in input_paths]
+            for input_path, future in zip(input_paths, futures):
+                try:
+                    chunk, errors = future.result()
+                except Exception as error:
+                    # A failed file is left out of the combined result instead of stopping the batch.
+                    print(f"{input_path}: The file failed: {error}")
+                    continue
+                for line in errors.splitlines():
+                    print(f"{input_path}: {line}")
+                if combined:
+                    combined.import_chunk(chunk)
+
+        if combined:
+            combined.write_data()
@@ -0,0 +1,162 @@
+import hashlib
+import os
+import tempfile
+
+
+class CachedResult:
+    """
+    A result found in the ResultCache: the output and the diagnostic messages of a previous run.
+    """
+    block_size = 1 << 20
+
+    def __init__(self, output_path:str, errors_path:str):
+        self.output_path = output_path
+        self.errors_path = errors_path
+
+    def iter_errors(self):
+        with open(self.errors_path, encoding="utf-8", newline="\n") as file:
+            for line in file:
+                yield line[:-1]
+
+    def iter_output(self):
+        """
+        Iterates over the output in large blocks of text.
+        """
+        with open(self.output_path, encoding="utf-8", newline="\n") as file:
+            for block in iter(lambda: file.read(self.block_size), ""):
+                yield block
+
+
+class CacheWriter:
+    """
+    Records the output and the diagnostic messages of a run, and stores them in the ResultCache when committed.
+    """
+    def __init__(self, cache, key:str):
+        self.cache = cache
+        self.key = key
+        self.output = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", newline="\n", dir=cache.directory, suffix=".tmp", delete=False)
+        self.errors = []
+
+    def write(self, text:str):
+        self.output.write(text)
+
+    def flush(self):
+        pass
+
+    def write_error(self, line:str):
+        self.errors.append(line)
+
+    def commit(self):
+        self.output.close()
+        output_path, errors_path = self.cache.get_paths(self.key)
+        with open(errors_path, "w", encoding="utf-8", newline="\n") as file:
+            file.writelines(f"{line}\n" for line in self.errors)
+        os.replace(self.output.name, output_path)
+        self.cache.evict()
+
+    def discard(self):
+        self.output.close()
+        os.remove(self.output.name)
+
+
+class ResultCache:
+    """
+    Stores the results of previous runs in a directory, addressed by a hash of the input content and the settings.
+    The least recently used results are evicted when the directory grows past its maximum size.
+    """
+    default_max_size = 1 << 30
+    block_size = 1 << 20
+    # Each hit or miss appends a byte to the file of its counter, so the counter is the size of the file.
+    # Appending is atomic, so the runs sharing the cache never lose a count, unlike rewriting a shared total.
+    counter_files = {"hits": "hits.count", "misses": "misses.count"}
+
+    def __init__(self, directory:str, max_size:int = None):
+        """
+        :param directory: The directory of the cached results, created if needed.
+        :param max_size: The amount of bytes the cached results may use.
+        """
+        self.directory = directory
+        self.max_size = max_size or self.default_max_size
+        os.makedirs(directory, exist_ok=True)
+
+    def get_key(self, input_path:str, settings:str) -> str:
+        """
+        Hashes the content of the input file together with the settings that change the result.
+        """
+        digest = hashlib.sha256(settings.encode("utf-8"))
+        digest.update(b"\0")
+        with open(input_path, "rb") as file:
+            for block in iter(lambda: file.read(self.block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get_paths(self, key:str) -> tuple[str, str]:
+        return os.path.join(self.directory, f"{key}.out"), os.path.join(self.directory, f"{key}.err")
+
+    def get(self, key:str) -> CachedResult | None:
+        """
+        Finds the result of a key, marking it as recently used, and counts the hit or the miss.
+        """
+        output_path, errors_path = self.get_paths(key)
+        try:
+            os.utime(output_path)
+            result = CachedResult(output_path, errors_path) if os.path.isfile(errors_path) else None
+        except FileNotFoundError:
+            result = None
+        self.count("hits" if result else "misses")
+        return result
+
+    def create(self, key:str) -> CacheWriter:
+        return CacheWriter(self, key)
+
+    def evict(self):
+        """
+        Removes the least recently used results until the cache fits its maximum size.
+        """
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".out"):
+                continue
+            output_path, errors_path = self.get_paths(name[:-len(".out")])
+            try:
+                size = os.path.getsize(output_path) + os.path.getsize(errors_path)
+                entries.append((os.path.getmtime(output_path), size, output_path, errors_path))
+            except FileNotFoundError:
+                continue
+            total_size += size
+
+        entries.sort()
+        for _, size, output_path, errors_path in entries:
+            if total_size <= self.max_size:
+                break
+            for path in (output_path, errors_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total_size -= size
+
+    def read_counters(self) -> dict:
+        counters = {}
+        for counter, name in self.counter_files.items():
+            path = os.path.join(self.directory, name)
+            counters[counter] = os.path.getsize(path) if os.path.isfile(path) else 0
+        return counters
+
+    def get_stats(self) -> dict:
+        """
+        Gets the amounts of hits and misses of every run, and the amount and size of the cached results.
+        """
+        stats = self.read_counters()
+        names = [name for name in os.listdir(self.directory) if name.endswith((".out", ".err"))]
+        stats["entries"] = sum(name.endswith(".out") for name in names)
+        stats["size"] = sum(os.path.getsize(os.path.join(self.directory, name)) for name in names)
+        return stats
+
+    def count(self, counter:str):
+        path = os.path.join(self.directory, self.counter_files[counter])
+        descriptor = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(descriptor, b".")
+        finally:
+            os.close(descriptor)
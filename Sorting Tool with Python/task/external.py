@@ -0,0 +1,210 @@
+import heapq
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from itertools import islice
+
+
+class SpilledRun:
+    """
+    A sorted run written by a worker process to a named temporary file, handed over to the parent process by its path.
+    The items are stored as pickled batches, which are much faster to write and read back than encoded lines.
+    """
+    # The amount of items in each pickled batch, which is what reading the run keeps in memory.
+    batch_size = 1 << 10
+
+    def __init__(self, path:str, count:int):
+        """
+        :param path: The file with the pickled batches of items.
+        :param count: How many items the run stands for, including the repeated ones dropped by a unique output.
+        """
+        self.path = path
+        self.count = count
+
+    def __iter__(self):
+        return self.read(self.path)
+
+    @staticmethod
+    def write(items, count:int, directory:str = None) -> "SpilledRun":
+        """
+        Writes sorted items to a named temporary file that another process can adopt with ExternalSorter.adopt_run.
+        :param directory: The directory of the file. If empty, the system temporary directory is used.
+        """
+        items = iter(items)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", suffix=".run", delete=False, dir=directory) as run:
+            while batch := list(islice(items, SpilledRun.batch_size)):
+                pickle.dump(batch, run, pickle.HIGHEST_PROTOCOL)
+        return SpilledRun(run.name, count)
+
+    @staticmethod
+    def read(path:str):
+        """
+        Reads back the items of a run written by write, in order. The file is opened on the first item requested.
+        """
+        with open(path, "rb") as file:
+            while True:
+                try:
+                    batch = pickle.load(file)
+                except EOFError:
+                    return
+                yield from batch
+
+    def discard(self):
+        """
+        Removes the file of a run that will not be adopted.
+        """
+        os.unlink(self.path)
+
+
+class ExternalSorter:
+    """
+    Sorts more items than fit in memory by spilling sorted runs to temporary files
+    and merging them back when the items are requested.
+    The run files stay closed until they are merged, and at most max_fan_in of them are merged at once:
+    when there are more, groups of them are merged into new runs in several passes.
+    """
+    # Size of the reference kept by the buffer list for each item.
+    reference_size = 8
+    # The most runs merged at once, which bounds the files open at the same time.
+    max_fan_in = 64
+
+    def __init__(self, memory_limit:int, encode=str, decode=str, unique:bool = False, temp_directory:str = None):
+        """
+        :param memory_limit: Approximate amount of bytes the buffered items may use before a run is spilled.
+        :param encode: Converts an item to the text stored in a run. The text must not contain new lines.
+        :param decode: Converts the text stored in a run back into an item.
+        :param unique: Whether the repeated items are dropped while buffered, so each run holds distinct items.
+        The same item may still be in several runs.
+        :param temp_directory: The directory where the temporary directory of the runs is created.
+        If empty, the system temporary directory is used.
+        """
+        self.memory_limit = memory_limit
+        self.encode = encode
+        self.decode = decode
+        self.unique = unique
+        self.temp_directory = temp_directory
+        self.buffered = set()
+        self.buffer = []
+        self.buffer_size = 0
+        # The temporary directory holding the run files, created with the first run.
+        self.directory = None
+        self.run_number = 0
+        # The paths of the runs with one encoded item per line.
+        self.runs = []
+        # The paths of the runs taken over from other processes, which are stored as pickled batches.
+        self.adopted = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, item):
+        """
+        Adds an item, spilling the buffered items to a new run if the memory limit is reached.
+        """
+        self.count += 1
+        if self.unique:
+            if item in self.buffered:
+                return
+            self.buffered.add(item)
+        self.buffer.append(item)
+        self.buffer_size += sys.getsizeof(item) + self.reference_size
+        if self.buffer_size >= self.memory_limit:
+            self.spill()
+
+    def spill(self):
+        """
+        Writes the buffered items as a sorted run to a temporary file.
+        """
+        if not self.buffer:
+            return
+
+        self.buffer.sort()
+        self.write_run(self.buffer)
+        self.buffer = []
+        self.buffered = set()
+        self.buffer_size = 0
+
+    def add_run(self, items:list, count:int = None):
+        """
+        Writes a list of items that is already sorted straight to a new run.
+        :param count: How many items the run stands for, if its repeated items were dropped. If empty, the length of the run.
+        """
+        self.write_run(items)
+        self.count += len(items) if count is None else count
+
+    def adopt_run(self, run:SpilledRun):
+        """
+        Takes over a run exported by another process, moving its file next to the other runs,
+        so it is removed when the sorter is closed.
+        """
+        path = self.get_run_path()
+        shutil.move(run.path, path)
+        self.adopted.append(path)
+        self.count += run.count
+
+    def get_run_path(self) -> str:
+        """
+        Names the file of a new run in the temporary directory of the sorter.
+        """
+        if self.directory is None:
+            if self.temp_directory:
+                os.makedirs(self.temp_directory, exist_ok=True)
+            self.directory = tempfile.TemporaryDirectory(prefix="sort-", dir=self.temp_directory)
+        self.run_number += 1
+        return os.path.join(self.directory.name, f"{self.run_number}.run")
+
+    def write_run(self, items):
+        encode = self.encode
+        path = self.get_run_path()
+        with open(path, "w", encoding="utf-8", newline="\n") as run:
+            run.writelines(f"{encode(item)}\n" for item in items)
+        self.runs.append(path)
+
+    def read_run(self, path:str):
+        """
+        Reads back the items of a spilled run, in order. The file is opened on the first item requested.
+        """
+        decode = self.decode
+        with open(path, "r", encoding="utf-8", newline="\n") as run:
+            for line in run:
+                yield decode(line[:-1])
+
+    def merge_runs(self):
+        """
+        Merges groups of max_fan_in runs into new runs until all the runs can be merged at once.
+        """
+        while len(self.runs) + len(self.adopted) > self.max_fan_in:
+            sources = [self.read_run(path) for path in self.runs] + [SpilledRun.read(path) for path in self.adopted]
+            paths = self.runs + self.adopted
+            self.runs = []
+            self.adopted = []
+            for start in range(0, len(sources), self.max_fan_in):
+                self.write_run(heapq.merge(*sources[start:start + self.max_fan_in]))
+                for path in paths[start:start + self.max_fan_in]:
+                    os.remove(path)
+
+    def __iter__(self):
+        """
+        Iterates over all the items in sorted order, merging the spilled runs with the buffered items.
+        """
+        self.buffer.sort()
+        if not self.runs and not self.adopted:
+            return iter(self.buffer)
+        self.merge_runs()
+        return heapq.merge(*(self.read_run(path) for path in self.runs),
+                           *(SpilledRun.read(path) for path in self.adopted), self.buffer)
+
+    def close(self):
+        """
+        Removes the temporary files of the spilled runs.
+        """
+        if self.directory is not None:
+            self.directory.cleanup()
+            self.directory = None
+        self.runs = []
+        self.adopted = []
@@ -0,0 +1,104 @@
+import ast
+import struct
+import sys
+from array import array
+
+
+class NpyHeader:
+    """
+    Reads and writes the header of .npy files of 64-bit integers, following the NPY format
+    (a magic string, the format version and a Python dictionary literal describing the array).
+    """
+    magic = b"\x93NUMPY"
+    alignment = 64
+    descriptions = {"<i8": "little", ">i8": "big"}
+
+    @classmethod
+    def format(cls, shape:tuple) -> bytes:
+        """
+        Builds the version 1.0 header of a C-ordered little-endian int64 array.
+        """
+        description = f"{{'descr': '<i8', 'fortran_order': False, 'shape': {shape!r}, }}"
+        # The header ends with a new line and is padded with spaces so the data starts aligned.
+        size = len(cls.magic) + 4 + len(description) + 1
+        padding = -size % cls.alignment
+        header = (description + " " * padding + "\n").encode("latin1")
+        return cls.magic + bytes((1, 0)) + struct.pack("<H", len(header)) + header
+
+    @classmethod
+    def read(cls, stream) -> tuple[str, tuple]:
+        """
+        Reads the header of a .npy file from a binary stream, leaving the stream at the start of the data.
+        :return: The byte order of the data ("little" or "big") and the shape of the array.
+        :raises ValueError: If the stream does not start with the header of an int64 array.
+        """
+        prefix = stream.read(len(cls.magic) + 2)
+        if len(prefix) < len(cls.magic) + 2 or not prefix.startswith(cls.magic):
+            raise ValueError("The input is not a .npy file.")
+
+        major_version = prefix[len(cls.magic)]
+        size_format = "<H" if major_version == 1 else "<I"
+        size_bytes = stream.read(struct.calcsize(size_format))
+        header = stream.read(struct.unpack(size_format, size_bytes)[0])
+        try:
+            description = ast.literal_eval(header.decode("utf-8" if major_version >= 3 else "latin1"))
+        except (ValueError, SyntaxError):
+            raise ValueError("The header of the .npy input is not valid.")
+
+        if description.get("descr") not in cls.descriptions or description.get("fortran_order"):
+            raise ValueError("The .npy input is not an array of 64-bit integers.")
+        return cls.descriptions[description["descr"]], tuple(description["shape"])
+
+
+class BinaryReader:
+    """
+    Reads 64-bit integers from a binary stream, either as raw little-endian values or as a .npy file.
+    """
+    block_size = 1 << 20
+
+    def __init__(self, stream, npy:bool, block_size:int = None):
+        """
+        :param stream: A binary stream, like sys.stdin.buffer or a file opened in "rb" mode.
+        :param npy: Whether the stream holds a .npy file instead of raw values.
+        :param block_size: The amount of bytes requested from the stream at once. Rounded down to whole values.
+        """
+        self.stream = stream
+        self.npy = npy
+        self.block_size = (block_size or self.block_size) // 8 * 8 or 8
+
+    def __iter__(self):
+        """
+        Iterates over blocks of values, as arrays of signed 64-bit values in the native byte order.
+        :raises ValueError: If the header of a .npy file is not valid or the input ends with an incomplete value.
+        """
+        byte_order = "little"
+        if self.npy:
+            byte_order, _ = NpyHeader.read(self.stream)
+
+        pending = b""
+        while True:
+            data = self.stream.read(self.block_size)
+            if not data:
+                break
+
+            data = pending + data
+            end = len(data) // 8 * 8
+            pending = data[end:]
+            values = array("q")
+            values.frombytes(data[:end])
+            if byte_order != sys.byteorder:
+                values.byteswap()
+            yield values
+
+        if pending:
+            raise ValueError("The binary input ends with an incomplete number.")
+
+
+def to_little_endian(values:array) -> bytes:
+    """
+    Converts an array of signed 64-bit values to raw little-endian bytes.
+    """
+    if sys.byteorder != "little":
+        values = array("q", values)
+        values.byteswap()
+    return values.tobytes()
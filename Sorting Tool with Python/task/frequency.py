@@ -0,0 +1,65 @@
+class FrequencyTable:
+    """
+    Counts the occurrences of each distinct item in a single pass.
+    """
+    def __init__(self, items=None):
+        self.counts = {}
+        self.total = 0
+        if items is not None:
+            self.add_all(items)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, item):
+        return item in self.counts
+
+    def add(self, item, count:int=1):
+        """
+        Registers an occurrence of an item.
+        :param item: The item to be counted.
+        :param count: How many occurrences are being registered at once.
+        """
+        counts = self.counts
+        counts[item] = counts.get(item, 0) + count
+        self.total += count
+
+    def add_all(self, items):
+        """
+        Registers one occurrence for each of the given items.
+        """
+        counts = self.counts
+        get = counts.get
+        added = 0
+        for item in items:
+            counts[item] = get(item, 0) + 1
+            added += 1
+        self.total += added
+
+    def add_counts(self, counts:dict):
+        """
+        Registers the occurrences of items that were already counted.
+        :param counts: The amount of occurrences of each item.
+        """
+        for item, count in counts.items():
+            self.add(item, count)
+
+    def count(self, item) -> int:
+        """
+        Gets how many times an item was registered.
+        """
+        return self.counts.get(item, 0)
+
+    def elements(self):
+        """
+        Iterates over the registered items, repeating each one as many times as it was counted.
+        """
+        for item, count in self.counts.items():
+            for _ in range(count):
+                yield item
+
+    def sorted_by_count(self) -> list[tuple[int, object]]:
+        """
+        Gets the (count, item) pairs sorted by count and then by the item itself.
+        """
+        return sorted((count, item) for item, count in self.counts.items())
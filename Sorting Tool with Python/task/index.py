@@ -0,0 +1,110 @@
+import os
+import tempfile
+
+
+class SortedIndex:
+    """
+    A file with the distinct items of every input processed so far, in natural order,
+    each one with its amount of occurrences, so new inputs can be merged into it without reprocessing the old ones.
+    """
+    header = "# sorting-tool index of {}s\n"
+
+    def __init__(self, path:str, item_type:str, encode=str, decode=str):
+        """
+        :param path: The path of the index file. It is created by the first update if it does not exist.
+        :param item_type: The type of the items, which must match the one the index was created with.
+        :param encode: Converts an item to the text stored in the index. The text must not contain new lines.
+        :param decode: Converts the text stored in the index back into an item.
+        """
+        self.path = path
+        self.item_type = item_type
+        self.encode = encode
+        self.decode = decode
+
+    def __iter__(self):
+        """
+        Iterates over the (item, count) pairs of the index, in natural order of the items.
+        :raises ValueError: If the file is not an index of the same type of items.
+        """
+        if not os.path.isfile(self.path):
+            return
+
+        decode = self.decode
+        with open(self.path, encoding="utf-8", newline="\n") as file:
+            if file.readline() != self.header.format(self.item_type):
+                raise ValueError(f"\"{self.path}\" is not an index of {self.item_type}s.")
+            for line in file:
+                count, text = line[:-1].split("\t", 1)
+                yield decode(text), int(count)
+
+    @staticmethod
+    def merge(old_counts, new_counts):
+        """
+        Merges two iterables of (item, count) pairs sorted by item into one, adding the counts of the same items.
+        """
+        old_counts = iter(old_counts)
+        new_counts = iter(new_counts)
+        old = next(old_counts, None)
+        new = next(new_counts, None)
+        while old is not None and new is not None:
+            if old[0] < new[0]:
+                yield old
+                old = next(old_counts, None)
+            elif new[0] < old[0]:
+                yield new
+                new = next(new_counts, None)
+            else:
+                yield old[0], old[1] + new[1]
+                old = next(old_counts, None)
+                new = next(new_counts, None)
+
+        if old is not None:
+            yield old
+            yield from old_counts
+        if new is not None:
+            yield new
+            yield from new_counts
+
+    def update(self, new_counts):
+        """
+        Merges new (item, count) pairs sorted by item into the index in one pass, replacing the file when done.
+        :return: An iterator over the merged (item, count) pairs, which must be consumed to update the file.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        encode = self.encode
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", dir=directory,
+                                         suffix=".tmp", delete=False) as file:
+            try:
+                file.write(self.header.format(self.item_type))
+                for item, count in self.merge(self, new_counts):
+                    file.write(f"{count}\t{encode(item)}\n")
+                    yield item, count
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, self.path)
+
+
+class IndexedItems:
+    """
+    Iterates over the items of a SortedIndex in natural order, repeating each one as many times as it occurred.
+    """
+    def __init__(self, index:SortedIndex, count:int):
+        """
+        :param index: The index with the items.
+        :param count: The total amount of occurrences of the items.
+        """
+        self.index = index
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for item, count in self.index:
+            for _ in range(count):
+                yield item
+
+    def close(self):
+        pass
@@ -1,17 +1,59 @@
+import sys
+from api import sort_file, sort_files
 from arguments import ArgumentParser
-from processors import ProcessorFactory
+from cache import ResultCache
 
 
-parser = ArgumentParser()
-parser.process()
+def main(arguments:list[str] = None):
+    """
+    Runs the command line tool.
+    :param arguments: The command line arguments. If not defined, the ones of sys.argv are used.
+    """
+    parser = ArgumentParser(arguments)
+    parser.process()
 
-datatype, output, input_path, output_path = parser.get_options_values()
-if not datatype or not output:
-    exit()
+    datatype, output, input_path, output_path = parser.get_options_values()
+    options = parser.get_processor_options()
+    if not datatype or not output:
+        return
 
-factory = ProcessorFactory()
-processor = factory.create(datatype, output, input_path, output_path)
+    if parser.get_cache_stats_value():
+        if not options.cache_directory:
+            print("No cache directory defined!")
+            return
+        stats = ResultCache(options.cache_directory).get_stats()
+        print(f"Cache hits: {stats['hits']}, misses: {stats['misses']}, "
+              f"results: {stats['entries']}, size: {stats['size']} bytes.")
+        return
 
-if processor:
-    processor.load_data()
-    processor.write_data()
+    serve, client, socket_path, queue_size = parser.get_server_values()
+    if serve:
+        # The daemon and asyncio are imported here, so plain runs do not pay their import.
+        import asyncio
+        from server import SortServer
+        server = SortServer(socket_path, options.workers, queue_size, options)
+        try:
+            asyncio.run(server.serve())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if client:
+        from server import SortClient
+        for parameter in SortClient.get_ignored_parameters(parser.get_given_parameters()):
+            print(f"The {parameter} parameter is not supported by the client. It will be ignored.")
+        header = SortClient.create_header(datatype, output, options, input_path, output_path)
+        payload = None if input_path else sys.stdin.buffer
+        SortClient(socket_path).request(header, payload, sys.stdout.buffer)
+        return
+
+    input_paths, output_directory, output_suffix, combined_path = parser.get_batch_values()
+    if input_paths:
+        sort_files(input_paths, datatype, output, options, output_directory, output_suffix, combined_path)
+        return
+
+    sort_file(input_path, output_path, datatype, output, options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from validation import ProcessorAlgorithms, ProcessorEngines, ProcessorFormats
+
+
+class ProcessorOptions:
+    """
+    Holds the optional settings that tune how a processor loads and sorts its data.
+    """
+    def __init__(self, memory_limit:int | None = None, engine:str = ProcessorEngines.python,
+                 algorithm:str = ProcessorAlgorithms.auto, workers:int = 1, limit:int = 10,
+                 profile:str = None, cprofile_path:str = None, pipeline_depth:int = 0, batch_size:int = None,
+                 cache_directory:str = None, cache_size:int = None, cache_bypass:bool = False,
+                 index_path:str = None, input_format:str = ProcessorFormats.text,
+                 output_format:str = ProcessorFormats.text, approx:bool = False, approx_memory:int = None,
+                 sketch_size:int = 200, unique:bool = False, temp_directory:str = None):
+        """
+        :param memory_limit: Approximate amount of bytes the items may use before being spilled to disk.
+        If empty, all the items are kept in memory.
+        :param engine: The engine used for integer data, must be one of the ProcessorEngines.
+        :param algorithm: The algorithm used to sort integer data, must be one of the ProcessorAlgorithms.
+        :param workers: The amount of processes that parse and sort chunks of the input in parallel.
+        :param limit: The amount of items shown by the top and bottom outputs.
+        :param profile: Where the profiling report is written: "stderr" or a file path. If empty, no report is written.
+        :param cprofile_path: If defined, a cProfile dump of the run is written to this file path.
+        :param pipeline_depth: The amount of input blocks read ahead by a background thread while the
+        previous ones are processed. If 0, the input is read and processed in turns.
+        :param batch_size: The amount of bytes of input read and processed at once. If empty, BlockReader decides.
+        :param cache_directory: The directory where the results of input files are cached. If empty, there is no cache.
+        :param cache_size: The amount of bytes the cached results may use. If empty, ResultCache decides.
+        :param cache_bypass: Whether the cache is neither read nor updated.
+        :param index_path: If defined, the file where the counted items of every input are kept sorted,
+        so the output covers all the inputs processed so far.
+        :param input_format: The format integer data is read in, must be one of the ProcessorFormats.
+        :param output_format: The format sorted integer data is written in, must be one of the ProcessorFormats.
+        :param approx: Whether the byCount output shows only the approximately most frequent items
+        and the percentiles output estimates the percentiles, both in bounded memory.
+        :param approx_memory: The amount of bytes used to find the most frequent items. If empty, SpaceSaving decides.
+        :param sketch_size: The capacity of the sketch that estimates the percentiles. Larger sizes are more accurate.
+        :param unique: Whether the natural output shows each distinct item once, dropping the repeated items while processing.
+        :param temp_directory: The directory of the temporary files of the spilled items, created if needed.
+        If empty, the system temporary directory is used.
+        """
+        self.memory_limit = memory_limit
+        self.engine = engine
+        self.algorithm = algorithm
+        self.workers = workers
+        self.limit = limit
+        self.profile = profile
+        self.cprofile_path = cprofile_path
+        self.pipeline_depth = pipeline_depth
+        self.batch_size = batch_size
+        self.cache_directory = cache_directory
+        self.cache_size = cache_size
+        self.cache_bypass = cache_bypass
+        self.index_path = index_path
+        self.input_format = input_format
+        self.output_format = output_format
+        self.approx = approx
+        self.approx_memory = approx_memory
+        self.sketch_size = sketch_size
+        self.unique = unique
+        self.temp_directory = temp_directory
@@ -0,0 +1,104 @@
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from readers import BlockReader
+
+
+def process_chunk(processor_class, output_type:str, options, block:str):
+    """
+    Processes a chunk of input in a worker process.
+    :return: The exported state of the worker processor and the diagnostic messages it produced.
+    """
+    processor = processor_class(output_type, None, None, options)
+    processor.diagnostics = StringIO()
+    try:
+        processor.process_block(block)
+        return processor.export_chunk(), processor.diagnostics.getvalue()
+    finally:
+        processor.close()
+
+
+class SortedRuns:
+    """
+    Keeps sorted runs of items in memory and merges them while iterating.
+    """
+    def __init__(self):
+        self.runs = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add_run(self, run:list, count:int = None):
+        """
+        Adds a list of items that is already sorted.
+        :param count: How many items the run stands for, if its repeated items were dropped. If empty, the length of the run.
+        """
+        self.runs.append(run)
+        self.count += len(run) if count is None else count
+
+    def __iter__(self):
+        if len(self.runs) == 1:
+            return iter(self.runs[0])
+        return heapq.merge(*self.runs)
+
+    def close(self):
+        self.runs = []
+
+
+class ChunkPool:
+    """
+    Splits the input in chunks of whole lines and processes them in a pool of worker processes.
+    """
+    chunk_size = 1 << 23
+    min_chunk_size = 1 << 16
+
+    def __init__(self, workers:int, chunk_size:int = None):
+        """
+        :param workers: The amount of worker processes.
+        :param chunk_size: The amount of bytes of input in each chunk. If empty, the default chunk_size is used.
+        """
+        self.workers = workers
+        if chunk_size:
+            self.chunk_size = chunk_size
+
+    def read_blocks(self, stream) -> BlockReader:
+        """
+        Splits a binary stream into chunks of whole lines.
+        """
+        return BlockReader(stream, self.chunk_size)
+
+    def split_lines(self, lines):
+        """
+        Groups lines of text that are already in memory into chunks of about chunk_size characters,
+        joined like the blocks of BlockReader.
+        """
+        chunk = []
+        size = 0
+        for line in lines:
+            line = line.rstrip("\n")
+            chunk.append(line)
+            size += len(line) + 1
+            if size >= self.chunk_size:
+                yield "\n".join(chunk)
+                chunk = []
+                size = 0
+        if chunk:
+            yield "\n".join(chunk)
+
+    def map(self, processor_class, output_type:str, options, chunks):
+        """
+        Processes all the chunks of whole lines, keeping at most two chunks per worker in flight.
+        :param chunks: The chunks from read_blocks or split_lines.
+        :return: An iterator over the results of process_chunk, in the same order as the input.
+        """
+        with ProcessPoolExecutor(self.workers) as pool:
+            pending = deque()
+            for block in chunks:
+                pending.append(pool.submit(process_chunk, processor_class, output_type, options, block))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
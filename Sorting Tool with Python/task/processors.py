@@ -1,7 +1,26 @@
+import math
 import sys
 from abc import ABC, abstractmethod
-from io import StringIO
-from validation import ProcessorOutputs, ProcessorTypes
+from array import array
+from copy import copy
+from itertools import islice
+from aggregates import LengthHistogram, MaxAggregate
+from algorithms import select_ranks, unique_sorted
+from cache import ResultCache
+from external import ExternalSorter, SpilledRun
+from formats import BinaryReader, NpyHeader, to_little_endian
+from frequency import FrequencyTable
+from index import IndexedItems, SortedIndex
+from options import ProcessorOptions
+from parallel import ChunkPool, SortedRuns
+from profiling import Profiler
+from readers import BlockReader, PrefetchReader
+from selection import BoundedSelection
+from sketches import QuantileSketch, SpaceSaving
+from storage import DictionaryStore, DistinctStore, IntegerArray
+from validation import ProcessorEngines, ProcessorFormats, ProcessorOutputs, ProcessorTypes
+from vectorized import NumpyIntegerStore
+from writers import OutputSink
 import os
 
 
@@ -9,19 +28,73 @@ class Processor(ABC):
     """
     Abstract class for processing some type of data.
     """
-    def __init__(self, output_type:str, input_path:str, output_path:str):
+    # The fractions of the items shown by the percentiles output, with their names.
+    percentiles = ((0.0, "Minimum"), (0.5, "Median"), (0.9, "90th percentile"), (0.99, "99th percentile"),
+                   (1.0, "Maximum"))
+
+    def __init__(self, output_type:str, input_path:str, output_path:str, options:ProcessorOptions = None):
         self.output_type = output_type
         self.input_path = input_path
         self.output_path = output_path
-        self.log = StringIO()
+        self.options = options or ProcessorOptions()
+        self.output = None
+        # A text stream the results are written to instead of the output_path or the standard output.
+        self.output_stream = None
+        self.diagnostics = sys.stdout
+        self.profiler = Profiler(self.options.profile, self.options.cprofile_path)
         self.outputs = {
             ProcessorOutputs.summary: self.print_summary,
             ProcessorOutputs.sorted: self.print_sorted,
             ProcessorOutputs.sorted_count: self.print_sorted_count,
+            ProcessorOutputs.top: self.print_selection,
+            ProcessorOutputs.bottom: self.print_selection,
+            ProcessorOutputs.by_length: self.print_by_length,
         }
         self.item_type = None
         self.superlative = None
-        self.items = []
+        self.separator = " "
+        # Whether the results are written as binary values in the output_format, so the output must accept bytes.
+        self.binary_output = False
+        # Whether the natural output shows each distinct item once.
+        self.unique = self.options.unique and self.output_type == ProcessorOutputs.sorted
+        self.items = DistinctStore() if self.unique else []
+        self.frequencies = None
+        self.summary = None
+        self.selection = None
+        self.lengths = None
+        self.heavy_hitters = None
+        self.quantiles = None
+        # The summary, selection, lengths, heavy hitters or quantiles kept instead of the items, if the output needs one.
+        self.aggregate = None
+        self.sorter = None
+        self.cache = None
+        self.cached_result = None
+        self.cache_writer = None
+        # Whether loading the data failed, so there is no result to write.
+        self.failed = False
+        if self.options.cache_directory and not self.options.cache_bypass:
+            self.cache = ResultCache(self.options.cache_directory, self.options.cache_size)
+        if self.output_type == ProcessorOutputs.summary:
+            self.summary = self.aggregate = self.create_summary()
+        if self.output_type in (ProcessorOutputs.top, ProcessorOutputs.bottom):
+            self.selection = self.aggregate = BoundedSelection(
+                self.options.limit, self.output_type == ProcessorOutputs.top, self.get_rank_key())
+        if self.output_type == ProcessorOutputs.by_length:
+            self.lengths = self.aggregate = LengthHistogram(self.get_length_key())
+        if self.options.index_path and self.output_type not in (
+                ProcessorOutputs.sorted, ProcessorOutputs.sorted_count, ProcessorOutputs.summary):
+            self.write_error("The index only supports the natural, byCount and summary sorting types. "
+                             "It will be ignored.")
+            self.options = copy(self.options)
+            self.options.index_path = None
+        if self.output_type == ProcessorOutputs.sorted_count and self.options.approx and not self.options.index_path:
+            self.heavy_hitters = self.aggregate = SpaceSaving.from_memory(self.options.approx_memory)
+            self.outputs[ProcessorOutputs.sorted_count] = self.print_heavy_hitters
+        if self.options.unique and not self.unique:
+            self.write_error("The -unique option only applies to the natural sorting type. It will be ignored.")
+        if self.options.memory_limit:
+            self.sorter = ExternalSorter(self.options.memory_limit, self.encode_item, self.decode_item, self.unique,
+                                         self.options.temp_directory)
 
     @abstractmethod
     def process(self, current_input):
@@ -30,6 +103,13 @@ class Processor(ABC):
         """
         pass
 
+    def process_block(self, block:str):
+        """
+        Processes a block of whole lines of input, separated by new lines.
+        """
+        for line in block.split("\n"):
+            self.process(line)
+
     @abstractmethod
     def get_max(self):
         """
@@ -56,98 +136,553 @@ class Processor(ABC):
     @abstractmethod
     def format_sorted(self):
         """
-        Formats the sorted output into a string for output.
+        Formats the sorted output into pieces of text for output.
         """
         pass
 
+    def create_summary(self) -> MaxAggregate:
+        """
+        Creates the running aggregates used by the summary output.
+        """
+        return MaxAggregate()
+
+    def get_rank_key(self):
+        """
+        Gets the function that ranks the items for the top and bottom outputs, or None to rank them by themselves.
+        """
+        return None
+
+    def get_length_key(self):
+        """
+        Gets the function that measures the length of the items for the byLength output.
+        """
+        return len
+
+    def encode_item(self, item) -> str:
+        """
+        Converts an item to the single line of text used when it is spilled to disk.
+        """
+        return item
+
+    def decode_item(self, text:str):
+        """
+        Converts a line of text spilled to disk back into an item.
+        """
+        return text
+
+    def add_item(self, item):
+        """
+        Stores a processed item, spilling it to disk if the memory limit requires it.
+        For the summary, top, bottom, byLength and approximate byCount and percentiles outputs
+        only the aggregate the output needs is kept.
+        """
+        if self.aggregate:
+            self.aggregate.add(item)
+        elif self.sorter is not None:
+            self.sorter.add(item)
+        else:
+            self.items.append(item)
+
+    def add_items(self, items):
+        """
+        Stores several processed items at once.
+        """
+        if self.aggregate:
+            self.aggregate.add_all(items)
+        elif self.sorter is not None:
+            for item in items:
+                self.add_item(item)
+        else:
+            self.items.extend(items)
+
+    def iter_items(self):
+        """
+        Iterates over all the stored items, in no particular order.
+        """
+        if self.sorter is not None:
+            return iter(self.sorter)
+        return iter(self.items)
+
+    def iter_sorted(self):
+        """
+        Iterates over all the stored items in natural order.
+        When items were spilled to disk the sorted runs are merged while iterating,
+        skipping the items repeated across runs if the output is unique.
+        """
+        if self.sorter is not None:
+            return unique_sorted(self.sorter) if self.unique else iter(self.sorter)
+        with self.profiler.phase("sort"):
+            self.sort_items()
+        return iter(self.items)
+
+    def sort_items(self):
+        """
+        Sorts the items kept in memory.
+        """
+        self.items.sort()
+
     def load_data(self):
+        self.profiler.start()
+        if self.load_cached():
+            return
+        if self.options.index_path:
+            self.load_indexed()
+            return
         if not self.input_path or not os.path.isfile(self.input_path):
             self.read_from_input()
             return
 
         self.read_from_file()
 
-    def write_data(self):
+    def load_cached(self) -> bool:
         """
-        Writes the output data according to the type required by the application.
+        Looks up the result of the input_path file in the cache. On a miss, the result of this run is recorded.
+        :return: Whether the result was found, so the input does not need to be processed.
+        """
+        if not self.cache or self.options.index_path or self.options.output_format != ProcessorFormats.text:
+            return False
+        if not self.input_path or not os.path.isfile(self.input_path):
+            return False
+
+        settings = (f"{type(self).__name__} {self.output_type} {self.options.limit} {self.options.input_format} "
+                    f"{self.options.approx} {self.options.approx_memory} {self.options.sketch_size} {self.unique}")
+        key = self.cache.get_key(self.input_path, settings)
+        self.cached_result = self.cache.get(key)
+        if not self.cached_result:
+            self.profiler.count("cache_misses")
+            self.cache_writer = self.cache.create(key)
+            return False
+
+        self.profiler.count("cache_hits")
+        for line in self.cached_result.iter_errors():
+            self.write_error(line)
+        return True
+
+    def load_indexed(self, lines = None):
+        """
+        Counts the items of the input on their own and merges them into the index_path file,
+        gathering the items of every input processed so far for the output.
+        If the index_path file is not a valid index, there is no output.
+        :param lines: The lines of input already in memory, as for load_lines. If empty, the input is loaded.
+        """
+        input_options = copy(self.options)
+        input_options.index_path = None
+        input_options.cache_directory = None
+        input_options.unique = False
+        input_processor = type(self)(ProcessorOutputs.sorted_count, self.input_path, None, input_options)
+        input_processor.diagnostics = self.diagnostics
+        try:
+            if lines is None:
+                input_processor.load_data()
+            else:
+                input_processor.load_lines(lines)
+            new_counts = sorted(input_processor.get_frequencies().counts.items())
+        finally:
+            input_processor.close()
+
+        index = SortedIndex(self.options.index_path, self.item_type, self.encode_item, self.decode_item)
+        try:
+            with self.profiler.phase("merge"):
+                self.gather_indexed(index, index.update(new_counts))
+        except ValueError as error:
+            self.write_error(str(error))
+            self.failed = True
+
+    def gather_indexed(self, index:SortedIndex, merged_counts):
+        """
+        Gathers the merged (item, count) pairs of the index for the output.
+        """
+        if self.output_type == ProcessorOutputs.sorted:
+            self.sorter = IndexedItems(index, sum(count for _, count in merged_counts))
+        elif self.output_type == ProcessorOutputs.sorted_count:
+            self.frequencies = FrequencyTable()
+            for item, count in merged_counts:
+                self.frequencies.add(item, count)
+        else:
+            for item, count in merged_counts:
+                self.summary.add_group(item, count, count)
+
+    def load_lines(self, lines):
+        """
+        Processes lines of input that are already in memory, instead of reading the input_path or the standard input.
+        Like the input, they are merged into the index_path file and split among the workers if defined.
+        :param lines: An iterable of lines, each one processed as if it was read from the input.
         """
-        if self.output_type in self.outputs:
-            self.outputs[self.output_type]()
+        self.profiler.start()
+        if self.options.index_path:
+            self.load_indexed(lines)
+            return
+        if self.options.workers > 1:
+            pool = self.create_chunk_pool()
+            self.gather_chunks(pool, pool.split_lines(lines))
+            return
 
+        with self.profiler.phase("parse"):
+            for line in lines:
+                self.process(line)
+
+    def open_output(self) -> OutputSink:
+        """
+        Opens the sink for the results: the output_stream or the output_path file if defined, the standard output otherwise.
+        """
+        if self.output_stream:
+            return OutputSink(self.output_stream, mirror=self.cache_writer)
         if self.output_path:
-            with open(self.output_path, "w", encoding="utf-8") as file:
-                file.write(self.log.getvalue())
+            stream = open(self.output_path, "w", encoding="utf-8")
+            return OutputSink(stream, close_stream=True, mirror=self.cache_writer)
+        return OutputSink(sys.stdout, mirror=self.cache_writer)
+
+    def write_data(self):
+        """
+        Writes the output data according to the type required by the application.
+        """
+        self.output = self.open_output()
+        completed = False
+        try:
+            with self.profiler.phase("write"):
+                if self.cached_result:
+                    for block in self.cached_result.iter_output():
+                        self.write(block)
+                elif self.output_type in self.outputs and not self.failed:
+                    self.outputs[self.output_type]()
+            completed = True
+        finally:
+            try:
+                # Closing flushes the last pieces, so the output is only complete once it succeeds.
+                with self.profiler.phase("write"):
+                    self.output.close()
+            except BaseException:
+                completed = False
+                raise
+            finally:
+                self.close()
+                if self.cache_writer:
+                    if completed:
+                        self.cache_writer.commit()
+                    else:
+                        self.cache_writer.discard()
+        self.profiler.finish(self.get_total())
 
+    def close(self):
+        """
+        Releases the temporary files used by the processor.
+        """
+        if self.sorter is not None:
+            self.sorter.close()
 
     def write_line(self, line:str):
         """
         Writes a line of output to the processor output_path definition (including a new line at the end)
         :param line: The content to be written.
         """
-        print(line)
-        print(line, file=self.log)
+        self.output.write_line(line)
+
+    def write(self, text:str):
+        """
+        Writes a piece of output to the processor output_path definition (without a new line at the end)
+        :param text: The content to be written.
+        """
+        self.output.write(text)
+
+    def write_error(self, line:str):
+        """
+        Writes a diagnostic message to the console, even when the results go to the output_path.
+        :param line: The message to be written.
+        """
+        if self.output:
+            self.output.flush()
+        if self.cache_writer:
+            self.cache_writer.write_error(line)
+        print(line, file=self.diagnostics)
+
+    def read_from_stream(self, stream):
+        """
+        Reads a binary stream in blocks of whole lines and processes each block.
+        """
+        if self.options.workers > 1:
+            self.read_in_parallel(stream)
+            return
+
+        for block in self.profiler.iterate("read", self.read_blocks(stream)):
+            self.profiler.count("blocks")
+            with self.profiler.phase("parse"):
+                self.process_block(block)
+
+    def read_blocks(self, stream):
+        """
+        Gets the blocks of whole lines of a binary stream, read ahead in a background thread if pipelined.
+        The workers do not read ahead: their chunks are already processed while the next ones are read,
+        and forking the worker processes while a thread reads could deadlock them.
+        """
+        blocks = BlockReader(stream, self.options.batch_size)
+        if self.options.pipeline_depth:
+            return PrefetchReader(blocks, self.options.pipeline_depth)
+        return blocks
+
+    def read_in_parallel(self, stream):
+        """
+        Processes chunks of a binary stream in worker processes and gathers their results in input order.
+        """
+        pool = self.create_chunk_pool()
+        self.gather_chunks(pool, pool.read_blocks(stream))
+
+    def create_chunk_pool(self) -> ChunkPool:
+        # Under a memory limit the chunks are about as large as it, since each one is parsed in memory by a worker.
+        chunk_size = None
+        if self.options.memory_limit:
+            chunk_size = min(max(self.options.memory_limit, ChunkPool.min_chunk_size), ChunkPool.chunk_size)
+        return ChunkPool(self.options.workers, chunk_size)
+
+    def gather_chunks(self, pool:ChunkPool, blocks):
+        """
+        Processes the chunks of input in the worker processes of the pool and gathers their results in input order.
+        """
+        worker_options = copy(self.options)
+        worker_options.workers = 1
+        self.prepare_import()
+
+        chunks = pool.map(type(self), self.output_type, worker_options, blocks)
+        for chunk, errors in self.profiler.iterate("parse", chunks):
+            self.profiler.count("chunks")
+            for line in errors.splitlines():
+                self.profiler.count("invalid_tokens")
+                self.write_error(line)
+            self.import_chunk(chunk)
+
+    def export_chunk(self, spill:bool = False):
+        """
+        Exports what a worker processor gathered from its chunk of input:
+        the aggregate the output needs, the item counts for byCount, a SpilledRun of the sorted items under a
+        memory limit, the amount of items and the sorted distinct items for the unique output,
+        or the sorted items otherwise.
+        :param spill: If the sorted items are always exported as a SpilledRun, so the importing processor
+        does not keep them in memory. The importing processor must be prepared with prepare_import(spilled=True).
+        """
+        if self.aggregate:
+            return self.aggregate
+        if self.output_type == ProcessorOutputs.sorted_count:
+            return self.get_frequencies().counts
+        if spill or isinstance(self.sorter, ExternalSorter):
+            return SpilledRun.write(self.iter_sorted(), self.get_total(), self.options.temp_directory)
+        if self.unique:
+            return self.get_total(), list(self.iter_sorted())
+        return list(self.iter_sorted())
+
+    def use_exported_run(self, run:SpilledRun):
+        """
+        Writes the output from the SpilledRun returned by export_chunk instead of the stored items,
+        so they are not sorted again and are released before writing. The run file is left for its importer.
+        """
+        if self.sorter is not None:
+            self.sorter.close()
+        self.items = []
+        self.sorter = SortedRuns()
+        self.sorter.add_run(run, run.count)
+
+    def prepare_import(self, spilled:bool = False):
+        """
+        Prepares the processor to gather the exported state of other processors with import_chunk.
+        :param spilled: If the sorted items are imported as SpilledRun files, which are merged from disk.
+        """
+        if self.output_type not in (ProcessorOutputs.sorted, ProcessorOutputs.percentiles) or self.sorter is not None:
+            return
+        if spilled:
+            # The sorter only adopts runs, so nothing is ever buffered against the memory limit.
+            self.sorter = ExternalSorter(0, self.encode_item, self.decode_item, self.unique,
+                                         self.options.temp_directory)
+        else:
+            self.sorter = SortedRuns()
+
+    def import_chunk(self, chunk):
+        """
+        Gathers the exported state of a worker processor.
+        """
+        if self.aggregate:
+            self.aggregate.merge(chunk)
+        elif self.output_type == ProcessorOutputs.sorted_count:
+            if self.frequencies is None:
+                self.frequencies = FrequencyTable()
+            self.frequencies.add_counts(chunk)
+        elif isinstance(chunk, SpilledRun):
+            self.sorter.adopt_run(chunk)
+        elif self.unique:
+            count, run = chunk
+            self.sorter.add_run(run, count)
+        else:
+            self.sorter.add_run(chunk)
 
     def read_from_input(self):
         """
-        Reads a line from the standard input and processes it.
-        Breaks execution when an EOF character entered by the user.
+        Reads the standard input until an EOF character and processes it.
+        A standard input without a byte stream under it, like a test harness mock, is read line by line.
+        """
+        stream = getattr(sys.stdin, "buffer", None)
+        if stream is None:
+            with self.profiler.phase("parse"):
+                for line in self.iter_input_lines():
+                    self.process(line)
+            return
+
+        self.read_from_stream(stream)
+
+    @staticmethod
+    def iter_input_lines():
+        """
+        Iterates over the lines of the standard input with input(), until an EOF character.
         """
         while True:
             try:
-                data = input()
-                self.process(data)
+                yield input()
             except EOFError:
-                break
+                return
 
     def read_from_file(self):
         """
         Reads all the inputs from a file and processes it.
         :return:
         """
-        with open(self.input_path,"r", encoding="utf-8" ) as file:
-            for line in file.readlines():
-                self.process(line)
+        with open(self.input_path, "rb") as file:
+            self.read_from_stream(file)
+
+    def get_frequencies(self) -> FrequencyTable:
+        """
+        Gets the table with the occurrences of each item, counting them in a single pass on first use.
+        """
+        if self.frequencies is None:
+            self.frequencies = FrequencyTable(self.iter_items())
+        return self.frequencies
+
+    def get_summary(self) -> MaxAggregate:
+        """
+        Gets the aggregates of the maximum items, computing them from the stored items if they were not kept while processing.
+        """
+        if self.summary is None:
+            self.summary = self.create_summary()
+            self.summary.add_all(self.iter_items())
+        return self.summary
+
+    def get_total(self) -> int:
+        """
+        Gets the total number of items being processed.
+        """
+        if self.summary is not None:
+            return self.summary.count
+        if self.aggregate is not None:
+            return self.aggregate.count
+        if self.frequencies is not None:
+            return self.frequencies.total
+        if self.sorter is not None:
+            return len(self.sorter)
+        return len(self.items)
 
     def get_rate(self, counted):
         """
         Calculates the rate of occurrence for a counted item.
         """
-        return int(counted * 100 / len(self.items))
+        return int(counted * 100 / self.get_total())
 
     def print_total(self):
         """
         Prints the total number of items being processed.
         :return:
         """
-        self.write_line(f"Total {self.item_type}s: {len(self.items)}.")
+        self.write_line(f"Total {self.item_type}s: {self.get_total()}.")
 
     def print_summary(self):
         """
         Prints the summarized information of the processed items.
         """
+        if not self.get_total():
+            self.print_total()
+            return
+
         count = self.get_max_count()
         rate = self.get_rate(count)
         self.print_total()
-        print(f"The {self.superlative} {self.item_type}:"
+        self.write_line(f"The {self.superlative} {self.item_type}:"
               f"{self.format_max()}"
               f"({count} time(s), {rate}%).")
 
     def print_sorted(self):
         """
-        Prints the sorted items.
+        Prints the sorted items, or only the distinct ones if the output is unique.
+        """
+        self.print_total()
+        self.write("Sorted distinct data:" if self.unique else "Sorted data:")
+        for piece in self.format_sorted():
+            self.write(piece)
+        self.write_line("")
+
+    def print_selection(self):
+        """
+        Prints the greatest (top) or smallest (bottom) items kept while processing.
+        """
+        selected = self.selection.get_selected()
+        title = "Top" if self.selection.largest else "Bottom"
+        self.print_total()
+        self.write(f"{title} {len(selected)} {self.item_type}s:")
+        for item in selected:
+            self.write(f"{self.separator}{item}")
+        self.write_line("")
+
+    def print_by_length(self):
+        """
+        Prints how many items have each length, from the shortest to the longest.
+        """
+        self.print_total()
+        for length, count in self.lengths.sorted_by_length():
+            self.write_line(f"Length {length}: {count} {self.item_type}(s), {self.get_rate(count)}%")
+
+    def print_heavy_hitters(self):
         """
+        Prints the approximately most frequent items, like print_sorted_count,
+        after the bound of how much their counts may exceed the true ones.
+        """
+        most_frequent = self.heavy_hitters.get_most_frequent(self.options.limit)
         self.print_total()
-        self.write_line(f"Sorted data:{self.format_sorted()}")
+        max_error = max((error for _, _, error in most_frequent), default=0)
+        self.write_line(f"The {len(most_frequent)} most frequent {self.item_type}s are approximate: "
+                        f"each count exceeds the true one by at most {max_error}.")
+        for count, element, _ in most_frequent:
+            self.write_line(f"{element}: {count} time(s), {self.get_rate(count)}%")
+
+    def select_ranks(self, ranks:list[int]) -> list:
+        """
+        Picks the items at some 0-based positions of the natural order, in increasing order of position.
+        """
+        return select_ranks(self.iter_sorted(), ranks)
+
+    def print_percentiles(self):
+        """
+        Prints the minimum, the median, the 90th and 99th percentiles and the maximum of the items,
+        with the nearest-rank definition: the p-th percentile is the smallest item with at least p% of the items up to it.
+        The exact percentiles are selected from the items, the approximate ones are estimated by the quantiles sketch.
+        """
+        self.print_total()
+        total = self.get_total()
+        if not total:
+            return
+
+        fractions = [fraction for fraction, _ in self.percentiles]
+        if self.quantiles:
+            values = self.quantiles.get_quantiles(fractions)
+            error = self.quantiles.get_rank_error() * 100
+            self.write_line(f"The percentiles are approximate: each rank is off by less than {error:.2f}% "
+                            f"with 99% confidence.")
+        else:
+            with self.profiler.phase("sort"):
+                values = self.select_ranks([max(math.ceil(fraction * total), 1) - 1 for fraction in fractions])
+        for (_, name), value in zip(self.percentiles, values):
+            self.write_line(f"{name}: {value}")
 
     def print_sorted_count(self):
         """
         Prints the items sorted by repetition rate.
         """
-        self.print_total()
-        unique_elements = set(self.items)
-        counted_elements = [(self.items.count(element), element) for element in unique_elements]
-        counted_elements.sort()
+        with self.profiler.phase("count"):
+            counted_elements = self.get_frequencies().sorted_by_count()
 
+        self.print_total()
         for count, element in counted_elements:
             self.write_line(f"{element}: {count} time(s), {self.get_rate(count)}%")
 
@@ -156,56 +691,246 @@ class IntegerProcessor(Processor):
     """
     Specific processor for sorting integer data.
     """
-    def __init__(self, output_type:str, input_path:str, output_path:str):
-        super().__init__(output_type, input_path, output_path)
+    def __init__(self, output_type:str, input_path:str, output_path:str, options:ProcessorOptions = None):
+        super().__init__(output_type, input_path, output_path, options)
         self.item_type = "number"
         self.superlative = "greatest"
+        self.items = DistinctStore() if self.unique else IntegerArray()
+        self.vectorized = False
+        self.outputs[ProcessorOutputs.percentiles] = self.print_percentiles
+        if self.output_type == ProcessorOutputs.percentiles and self.options.approx:
+            self.quantiles = self.aggregate = QuantileSketch(self.options.sketch_size)
+        if self.options.engine == ProcessorEngines.numpy:
+            self.use_numpy()
+        if self.options.output_format != ProcessorFormats.text:
+            self.use_binary_output()
+
+    def use_numpy(self):
+        """
+        Stores the numbers in a NumpyIntegerStore, unless NumPy is not installed or the items are spilled to disk.
+        The outputs kept as an aggregate never spill, so they are still parsed vectorized under a memory limit.
+        """
+        if not NumpyIntegerStore.is_available():
+            self.write_error("NumPy is not installed. The python engine will be used.")
+            return
+        if self.sorter is not None and not self.aggregate:
+            return
+
+        self.vectorized = True
+        self.items = NumpyIntegerStore(self.unique)
+
+    def use_binary_output(self):
+        """
+        Writes the natural and byCount outputs as 64-bit values in the output_format,
+        so the numbers that do not fit in 64 bits are skipped like invalid ones.
+        """
+        if self.output_type not in (ProcessorOutputs.sorted, ProcessorOutputs.sorted_count) or self.heavy_hitters:
+            self.write_error("The binary formats only support the natural and exact byCount sorting types. "
+                             "The text format will be used.")
+            return
+
+        self.binary_output = True
+        self.outputs[ProcessorOutputs.sorted] = self.write_sorted_binary
+        self.outputs[ProcessorOutputs.sorted_count] = self.write_counts_binary
 
     def process(self, current_input):
-        input_items = current_input.split()
-        for item in input_items:
+        """
+        Parses all the numbers of the input at once, falling back to one token at a time to report the invalid ones.
+        """
+        tokens = current_input.split()
+        if not self.binary_output:
+            try:
+                self.add_items(list(map(int, tokens)))
+                return
+            except ValueError:
+                pass
+
+        numbers = []
+        for item in tokens:
             try:
                 number = int(item)
-                self.items.append(number)
+                if self.binary_output and not NumpyIntegerStore.int64_min <= number <= NumpyIntegerStore.int64_max:
+                    raise ValueError
+                numbers.append(number)
             except ValueError:
-                self.write_line(f"\"{item}\" is not a long. It will be skipped.")
+                self.profiler.count("invalid_tokens")
+                self.write_error(f"\"{item}\" is not a long. It will be skipped.")
+        self.add_items(numbers)
+
+    def process_block(self, block:str):
+        if self.vectorized:
+            numbers = NumpyIntegerStore.parse(block)
+            if numbers is not None:
+                self.add_array(numbers)
+                return
+
+        self.process(block)
+
+    def read_from_stream(self, stream):
+        """
+        Reads a binary stream of text, or of 64-bit values if the input_format is binary or npy.
+        """
+        if self.options.input_format == ProcessorFormats.text:
+            super().read_from_stream(stream)
+            return
+
+        blocks = BinaryReader(stream, self.options.input_format == ProcessorFormats.npy, self.options.batch_size)
+        if self.options.pipeline_depth:
+            blocks = PrefetchReader(blocks, self.options.pipeline_depth)
+        try:
+            for values in self.profiler.iterate("read", blocks):
+                with self.profiler.phase("parse"):
+                    self.add_values(values)
+        except ValueError as error:
+            self.write_error(str(error))
+
+    def add_values(self, values:array):
+        """
+        Stores an array("q") of numbers read at once.
+        """
+        if self.vectorized:
+            self.add_array(NumpyIntegerStore.from_values(values))
+        else:
+            self.add_items(values)
+
+    def add_array(self, numbers):
+        """
+        Stores an int64 array of processed numbers at once.
+        """
+        if not len(numbers):
+            return
+        if self.summary:
+            self.summary.add_group(*NumpyIntegerStore.get_array_max(numbers), len(numbers))
+        elif self.aggregate:
+            self.aggregate.add_all(numbers.tolist())
+        else:
+            self.items.append_array(numbers)
+
+    def get_frequencies(self) -> FrequencyTable:
+        if self.sorter is None and self.frequencies is None:
+            self.frequencies = self.items.get_frequencies()
+        return super().get_frequencies()
 
+    def sort_items(self):
+        self.items.sort(self.options.algorithm)
+
+    def select_ranks(self, ranks:list[int]) -> list:
+        if self.sorter is None:
+            return self.items.select(ranks)
+        return super().select_ranks(ranks)
+
+    def encode_item(self, item) -> str:
+        return str(item)
+
+    def decode_item(self, text:str):
+        return int(text)
+
+    def get_length_key(self):
+        return self.get_digits
+
+    @staticmethod
+    def get_digits(number:int) -> int:
+        """
+        Gets the amount of digits of a number, which is its length for the byLength output.
+        """
+        return len(str(abs(number)))
 
     def get_max(self):
-        return max(self.items)
+        return self.get_summary().maximum
 
     def format_max(self):
         return f" {self.get_max()} "
 
     def get_max_count(self):
-        return self.items.count(self.get_max())
+        return self.get_summary().items.total
 
     def format_sorted(self):
-        self.items.sort()
-        formatted_items = " ".join(str(number) for number in self.items)
-        return f" {formatted_items}"
+        if self.vectorized and self.sorter is None:
+            with self.profiler.phase("sort"):
+                self.sort_items()
+            for chunk in self.items.iter_chunks():
+                yield " " + " ".join(map(str, chunk))
+            return
+
+        numbers = self.iter_sorted()
+        while chunk := list(islice(numbers, NumpyIntegerStore.chunk_size)):
+            yield " " + " ".join(map(str, chunk))
+
+    def iter_sorted_bytes(self):
+        """
+        Iterates over the sorted numbers as raw little-endian 64-bit values, in large chunks.
+        """
+        if self.vectorized and self.sorter is None:
+            with self.profiler.phase("sort"):
+                self.sort_items()
+            yield from self.items.iter_little_endian()
+            return
+
+        numbers = self.iter_sorted()
+        while chunk := array("q", islice(numbers, NumpyIntegerStore.chunk_size)):
+            yield to_little_endian(chunk)
+
+    def write_sorted_binary(self):
+        """
+        Writes the sorted numbers as raw little-endian 64-bit values, or as a one-dimensional .npy array.
+        For the unique output the distinct numbers are counted in a first pass, since the .npy header needs their amount.
+        """
+        if self.options.output_format == ProcessorFormats.npy:
+            count = self.get_total()
+            if self.unique:
+                count = sum(len(chunk) for chunk in self.iter_sorted_bytes()) // 8
+            self.output.write_bytes(NpyHeader.format((count,)))
+        for chunk in self.iter_sorted_bytes():
+            self.output.write_bytes(chunk)
+
+    def write_counts_binary(self):
+        """
+        Writes the (number, count) pairs sorted by count as raw little-endian 64-bit values,
+        or as a two-dimensional .npy array with one pair per row.
+        """
+        with self.profiler.phase("count"):
+            counted_elements = self.get_frequencies().sorted_by_count()
+
+        if self.options.output_format == ProcessorFormats.npy:
+            self.output.write_bytes(NpyHeader.format((len(counted_elements), 2)))
+        for start in range(0, len(counted_elements), NumpyIntegerStore.chunk_size):
+            pairs = array("q")
+            for count, number in counted_elements[start:start + NumpyIntegerStore.chunk_size]:
+                pairs.append(number)
+                pairs.append(count)
+            self.output.write_bytes(to_little_endian(pairs))
 
 
 class StringProcessor(Processor):
     """
     Specific processor for common text data.
     """
-    def __init__(self, output_type:str, input_path:str, output_path:str):
-        super().__init__(output_type, input_path, output_path)
+    def __init__(self, output_type:str, input_path:str, output_path:str, options:ProcessorOptions = None):
+        super().__init__(output_type, input_path, output_path, options)
         self.superlative = "longest"
+        if self.options.input_format != ProcessorFormats.text or self.options.output_format != ProcessorFormats.text:
+            self.write_error("The binary formats are only supported for the long data type. "
+                             "The text format will be used.")
+        if self.output_type in ProcessorOutputs.integer_types:
+            self.write_error(f"The {self.output_type} sorting type is only supported for the long data type.")
 
     def process(self, current_input):
         pass
 
+    def create_summary(self) -> MaxAggregate:
+        return MaxAggregate(key=len)
+
+    def get_rank_key(self):
+        return len
+
     def get_max(self):
-        longest_size = max([len(text) for text in self.items])
-        return [text for text in self.items if len(text) == longest_size]
+        return list(self.get_summary().items.elements())
 
     def format_max(self):
         pass
 
     def get_max_count(self):
-        return len(self.get_max())
+        return self.get_summary().items.total
 
     def format_sorted(self):
         pass
@@ -215,12 +940,13 @@ class LineProcessor(StringProcessor):
     """
     Specific processor for sorting lines of text.
     """
-    def __init__(self, output_type:str, input_path:str, output_path:str):
-        super().__init__(output_type, input_path, output_path)
+    def __init__(self, output_type:str, input_path:str, output_path:str, options:ProcessorOptions = None):
+        super().__init__(output_type, input_path, output_path, options)
         self.item_type = "line"
+        self.separator = "\n"
 
     def process(self, current_input):
-        self.items.append(current_input)
+        self.add_item(current_input.rstrip("\n"))
 
     def format_max(self):
         elements = self.get_max()
@@ -229,23 +955,35 @@ class LineProcessor(StringProcessor):
         return f"\n{formatted_elements}\n"
 
     def format_sorted(self):
-        self.items.sort()
-        formatted_items = "\n".join(self.items)
-        return f"\n{formatted_items}"
+        lines = self.iter_sorted()
+        while chunk := list(islice(lines, OutputSink.buffer_size)):
+            yield "\n" + "\n".join(chunk)
 
 
 class WordProcessor(StringProcessor):
     """
     Specific processor for sorting words from the input.
     """
-    def __init__(self, output_type:str, input_path:str, output_path:str):
-        super().__init__(output_type, input_path, output_path)
+    def __init__(self, output_type:str, input_path:str, output_path:str, options:ProcessorOptions = None):
+        super().__init__(output_type, input_path, output_path, options)
         self.item_type = "word"
+        self.items = DistinctStore() if self.unique else DictionaryStore()
 
     def process(self, current_input):
-        input_items = current_input.split()
-        for item in input_items:
-            self.items.append(item)
+        self.add_items(current_input.split())
+
+    def process_block(self, block:str):
+        self.process(block)
+
+    def get_frequencies(self) -> FrequencyTable:
+        if self.sorter is None and self.frequencies is None:
+            self.frequencies = self.items.get_frequencies()
+        return super().get_frequencies()
+
+    def get_summary(self) -> MaxAggregate:
+        if self.summary is None and self.sorter is None:
+            self.summary = self.items.get_summary(len)
+        return super().get_summary()
 
     def format_max(self):
         elements = self.get_max()
@@ -254,9 +992,15 @@ class WordProcessor(StringProcessor):
         return f" {formatted_elements} "
 
     def format_sorted(self):
-        self.items.sort()
-        formatted_items = " ".join(self.items)
-        return f" {formatted_items}"
+        if self.sorter is None and not self.unique:
+            with self.profiler.phase("sort"):
+                self.sort_items()
+            for word, count in self.items.iter_counts():
+                yield f" {word}" * count
+            return
+
+        for word in self.iter_sorted():
+            yield f" {word}"
 
 
 class ProcessorFactory:
@@ -270,7 +1014,8 @@ class ProcessorFactory:
             ProcessorTypes.word: WordProcessor,
         }
 
-    def create(self, datatype:str, output_type:str, input_path:str, output_path:str) -> Processor | None:
+    def create(self, datatype:str, output_type:str, input_path:str, output_path:str,
+               options:ProcessorOptions = None) -> Processor | None:
         """
         Creates and instance of processor if the datatype is valid.
         :param datatype: Represents the type of data to be processed, must be one of the ProcessorTypes.
@@ -278,9 +1023,10 @@ class ProcessorFactory:
         :param output_path: Represents a file path to write the output to. If empty, the standard output is used.
         :param output_path: Represents a file path to write the output to. If empty, the standard output is used.
         :param output_type: Must be one of the ProcessorOutputs.
+        :param options: Optional settings that tune how the data is loaded and sorted.
         :return: A new Processor if datatype is valid, None otherwise.
         """
         if datatype not in self.processors:
             return None
 
-        return self.processors[datatype](output_type, input_path, output_path)
\ No newline at end of file
+        return self.processors[datatype](output_type, input_path, output_path, options)
\ No newline at end of file
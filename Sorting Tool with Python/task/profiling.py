@@ -0,0 +1,123 @@
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Profiler:
+    """
+    Times the phases of a processor run and counts what it processed, reporting them as JSON.
+    When disabled every method returns right away, so normal runs are not slowed down.
+    """
+    def __init__(self, report_path:str = None, cprofile_path:str = None):
+        """
+        :param report_path: Where the JSON report is written: "stderr" or a file path. If empty, profiling is disabled.
+        :param cprofile_path: If defined, a cProfile dump of the run is written to this file path.
+        """
+        self.report_path = report_path
+        self.cprofile_path = cprofile_path
+        self.enabled = bool(report_path or cprofile_path)
+        self.phases = {}
+        self.counters = {}
+        self.nested_times = []
+        self.start_time = None
+        self.cprofile = None
+
+    def start(self):
+        """
+        Starts timing the whole run, and the cProfile collection if requested.
+        """
+        if not self.enabled:
+            return
+        self.start_time = time.perf_counter()
+        if self.cprofile_path:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextmanager
+    def phase(self, name:str):
+        """
+        Adds the time spent in the block to a phase, excluding the time of the phases nested in it.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        self.nested_times.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self.nested_times.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed - nested
+            if self.nested_times:
+                self.nested_times[-1] += elapsed
+
+    def iterate(self, name:str, iterable):
+        """
+        Adds the time spent getting each element of an iterable to a phase.
+        """
+        if not self.enabled:
+            return iterable
+        return self.timed_iterate(name, iter(iterable))
+
+    def timed_iterate(self, name:str, iterator):
+        while True:
+            with self.phase(name):
+                element = next(iterator, StopIteration)
+            if element is StopIteration:
+                return
+            yield element
+
+    def count(self, name:str, amount:int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @staticmethod
+    def get_peak_memory() -> int | None:
+        """
+        Gets the peak resident memory of this process and its workers, in KiB.
+        """
+        if resource is None:
+            return None
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return max(own, children)
+
+    def finish(self, items:int):
+        """
+        Stops the profiling and writes the report.
+        :param items: The total number of items that were processed.
+        """
+        if not self.enabled or self.start_time is None:
+            return
+
+        total_time = time.perf_counter() - self.start_time
+        self.start_time = None
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_path)
+
+        ingest_time = self.phases.get("read", 0.0) + self.phases.get("parse", 0.0)
+        report = {
+            "total_time": total_time,
+            "phases": self.phases,
+            "items": items,
+            "items_per_second": items / ingest_time if ingest_time else None,
+            "counters": self.counters,
+            "peak_memory_kb": self.get_peak_memory(),
+        }
+        if not self.report_path:
+            return
+        if self.report_path == "stderr":
+            print(json.dumps(report), file=sys.stderr)
+            return
+        with open(self.report_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,104 @@
+from queue import Full, Queue
+from threading import Event, Thread
+
+
+class BlockReader:
+    """
+    Reads text from a binary stream in large blocks.
+    Each block is cut at the last new line, so it always contains whole lines.
+    """
+    block_size = 1 << 20
+
+    def __init__(self, stream, block_size:int = None, encoding:str = "utf-8"):
+        """
+        :param stream: A binary stream, like sys.stdin.buffer or a file opened in "rb" mode.
+        :param block_size: The amount of bytes requested from the stream at once.
+        :param encoding: The encoding used to decode the bytes into text.
+        """
+        self.stream = stream
+        self.block_size = block_size or self.block_size
+        self.encoding = encoding
+
+    def decode(self, data:bytes | bytearray) -> str:
+        text = data.decode(self.encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        return text
+
+    def __iter__(self):
+        """
+        Iterates over the blocks of text, without the new line that ends the last line of each block.
+        """
+        pending = bytearray()
+        while True:
+            data = self.stream.read(self.block_size)
+            if not data:
+                break
+
+            end = data.rfind(b"\n")
+            if end == -1:
+                pending += data
+                continue
+
+            pending += data[:end + 1]
+            yield self.decode(pending)[:-1]
+            pending = bytearray(data[end + 1:])
+
+        if pending:
+            yield self.decode(pending)
+
+
+class PrefetchReader:
+    """
+    Iterates over the blocks of another reader, which are read ahead in a background thread,
+    so waiting for a slow stream overlaps with processing the blocks already read.
+    """
+    # Seconds between the checks of the reading thread for an abandoned iteration.
+    wait_interval = 0.1
+
+    def __init__(self, blocks, depth:int):
+        """
+        :param blocks: An iterable of blocks, like a BlockReader.
+        :param depth: The amount of blocks that may be read ahead.
+        """
+        self.blocks = blocks
+        self.depth = depth
+
+    def read_ahead(self, queue:Queue, stopped:Event):
+        try:
+            for block in self.blocks:
+                if not self.put(queue, stopped, (block, None)):
+                    return
+        except Exception as error:
+            self.put(queue, stopped, (None, error))
+            return
+        self.put(queue, stopped, (None, None))
+
+    def put(self, queue:Queue, stopped:Event, entry) -> bool:
+        """
+        Waits for room in the queue for an entry, unless the iteration was abandoned.
+        :return: Whether the entry was queued.
+        """
+        while not stopped.is_set():
+            try:
+                queue.put(entry, timeout=self.wait_interval)
+                return True
+            except Full:
+                continue
+        return False
+
+    def __iter__(self):
+        queue = Queue(self.depth)
+        stopped = Event()
+        thread = Thread(target=self.read_ahead, args=(queue, stopped), daemon=True)
+        thread.start()
+        try:
+            while True:
+                block, error = queue.get()
+                if error:
+                    raise error
+                if block is None:
+                    return
+                yield block
+        finally:
+            stopped.set()
@@ -0,0 +1,60 @@
+import heapq
+from itertools import chain
+
+
+class BoundedSelection:
+    """
+    Keeps only the K greatest or smallest items of a stream.
+    Items are buffered and reduced with heapq.nlargest/nsmallest, so memory stays bounded by K plus the buffer.
+    """
+    buffer_size = 1 << 12
+
+    def __init__(self, limit:int, largest:bool = True, key=None):
+        """
+        :param limit: The amount of items to keep.
+        :param largest: Whether the greatest items are kept, or the smallest ones.
+        :param key: Converts an item into the value used to rank it. If empty, the item itself is used.
+        Items with the same rank keep their input order.
+        """
+        self.limit = limit
+        self.largest = largest
+        self.key = key
+        self.selected = []
+        self.buffer = []
+        self.count = 0
+
+    def add(self, item):
+        self.buffer.append(item)
+        self.count += 1
+        if len(self.buffer) >= max(self.buffer_size, self.limit):
+            self.reduce()
+
+    def add_all(self, items):
+        for item in items:
+            self.add(item)
+
+    def reduce(self):
+        """
+        Keeps only the selected items among the previous selection and the buffered items.
+        """
+        if not self.buffer:
+            return
+
+        select = heapq.nlargest if self.largest else heapq.nsmallest
+        self.selected = select(self.limit, chain(self.selected, self.buffer), key=self.key)
+        self.buffer = []
+
+    def get_selected(self) -> list:
+        """
+        Gets the selected items, from the greatest for the largest ones or from the smallest otherwise.
+        """
+        self.reduce()
+        return self.selected
+
+    def merge(self, other:"BoundedSelection"):
+        """
+        Registers the selection of a later part of the same stream.
+        """
+        count = self.count
+        self.add_all(other.get_selected())
+        self.count = count + other.count
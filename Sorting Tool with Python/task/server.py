@@ -0,0 +1,287 @@
+"""
+Resident sorting daemon and its client, so frequent small jobs do not pay the process startup.
+
+The client sends a JSON header line with the settings of the job, using the names of the command line
+arguments (e.g. {"dataType": "long", "sortingType": "natural", "unique": true}), followed by the input data
+until it shuts down its side of the connection. With an "inputFile" the data is read by the daemon from that file
+instead. The daemon streams back what the command line would print and closes the connection. With an
+"outputFile" the daemon writes the result to that file instead, and only streams back the diagnostic messages.
+"""
+import asyncio
+import json
+import os
+import socket
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from copy import copy
+from io import StringIO
+from api import create_processor
+from options import ProcessorOptions
+from validation import ProcessorAlgorithms, ProcessorEngines, ProcessorFormats
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "sorting-tool.sock")
+
+# The processor options a job can set in its header, by their command line name,
+# with the ProcessorOptions attribute they set and a check of their values.
+JOB_OPTIONS = {
+    "limit": ("limit", lambda value: isinstance(value, int) and value > 0),
+    "memoryLimit": ("memory_limit", lambda value: isinstance(value, int) and value > 0),
+    "engine": ("engine", lambda value: value in ProcessorEngines.valid_types),
+    "algorithm": ("algorithm", lambda value: value in ProcessorAlgorithms.valid_types),
+    "inputFormat": ("input_format", lambda value: value in ProcessorFormats.valid_types),
+    "outputFormat": ("output_format", lambda value: value in ProcessorFormats.valid_types),
+    "approx": ("approx", lambda value: isinstance(value, bool)),
+    "approxMemory": ("approx_memory", lambda value: isinstance(value, int) and value > 0),
+    "sketchSize": ("sketch_size", lambda value: isinstance(value, int) and value > 1),
+    "unique": ("unique", lambda value: isinstance(value, bool)),
+}
+
+
+class SocketStream:
+    """
+    A text stream that sends what is written to a client connection of the event loop,
+    waiting while the client does not take the data.
+    """
+    def __init__(self, writer:asyncio.StreamWriter, loop:asyncio.AbstractEventLoop):
+        # The byte stream under the text stream, like sys.stdout.buffer, used by the binary output formats.
+        self.buffer = SocketBuffer(writer, loop)
+
+    def write(self, text:str):
+        self.buffer.write(text.encode("utf-8"))
+
+    def flush(self):
+        pass
+
+
+class SocketBuffer:
+    """
+    A binary stream that sends what is written to a client connection of the event loop,
+    waiting while the client does not take the data.
+    """
+    def __init__(self, writer:asyncio.StreamWriter, loop:asyncio.AbstractEventLoop):
+        self.writer = writer
+        self.loop = loop
+
+    async def send(self, data:bytes):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    def write(self, data:bytes):
+        asyncio.run_coroutine_threadsafe(self.send(data), self.loop).result()
+
+    def flush(self):
+        pass
+
+
+class SocketReader:
+    """
+    A binary stream that reads the data a client sends through a connection of the event loop,
+    so a job running in a worker thread takes its input as it arrives instead of buffering all of it.
+    """
+    def __init__(self, reader:asyncio.StreamReader, loop:asyncio.AbstractEventLoop):
+        self.reader = reader
+        self.loop = loop
+
+    async def receive(self, size:int) -> bytes:
+        if size < 0:
+            return await self.reader.read()
+        try:
+            return await self.reader.readexactly(size)
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+
+    async def discard(self):
+        """
+        Skips the rest of the data, so the client gets to read the response.
+        """
+        while await self.reader.read(1 << 16):
+            pass
+
+    def read(self, size:int = -1) -> bytes:
+        """
+        Reads the given amount of bytes, or fewer only at the end of the data.
+        """
+        return asyncio.run_coroutine_threadsafe(self.receive(size), self.loop).result()
+
+
+class SortServer:
+    """
+    Listens on a Unix socket and runs the jobs of many clients through a bounded job queue.
+    """
+    def __init__(self, socket_path:str = None, jobs:int = 1, queue_size:int = 64, options:ProcessorOptions = None):
+        """
+        :param socket_path: The path of the Unix socket. If empty, DEFAULT_SOCKET is used.
+        :param jobs: The amount of jobs that run at the same time.
+        :param queue_size: The amount of jobs that can wait to run. Further clients wait to be queued.
+        :param options: The processor options of every job. A job can change the ones of JOB_OPTIONS.
+        """
+        self.socket_path = socket_path or DEFAULT_SOCKET
+        self.jobs = jobs
+        self.queue_size = queue_size
+        self.options = copy(options or ProcessorOptions())
+        self.options.workers = 1
+        self.queue = None
+        self.runners = []
+        self.server = None
+        self.executor = None
+
+    async def start(self):
+        self.queue = asyncio.Queue(self.queue_size)
+        self.executor = ThreadPoolExecutor(self.jobs)
+        self.runners = [asyncio.create_task(self.run_jobs()) for _ in range(self.jobs)]
+        self.server = await asyncio.start_unix_server(self.handle_client, path=self.socket_path)
+
+    async def serve(self):
+        """
+        Runs the daemon until it is interrupted.
+        """
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for runner in self.runners:
+            runner.cancel()
+        self.executor.shutdown()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def create_job_processor(self, header:dict):
+        """
+        Creates the processor of a job from its header.
+        :return: The processor and the diagnostic messages of its construction, for the client.
+        :raises ValueError: If a setting of the job is not valid.
+        """
+        input_path = header.get("inputFile")
+        if input_path and not os.path.isfile(input_path):
+            raise ValueError(f"\"{input_path}\" is not an existent file.")
+        output_path = header.get("outputFile")
+        if output_path is not None and not (isinstance(output_path, str) and os.path.isabs(output_path)):
+            raise ValueError("The output file must be an absolute path.")
+
+        options = copy(self.options)
+        for name, (attribute, is_valid) in JOB_OPTIONS.items():
+            if name not in header:
+                continue
+            if not is_valid(header[name]):
+                raise ValueError(f"\"{header[name]}\" is not a valid value of {name}.")
+            setattr(options, attribute, header[name])
+
+        # The constructor reports the settings it ignores on the standard output, which is the daemon's.
+        diagnostics = StringIO()
+        with redirect_stdout(diagnostics):
+            processor = create_processor(header.get("dataType"), header.get("sortingType"), input_path, output_path,
+                                         options)
+        return processor, diagnostics.getvalue()
+
+    async def handle_client(self, reader:asyncio.StreamReader, writer:asyncio.StreamWriter):
+        try:
+            header = await reader.readline()
+            try:
+                processor, diagnostics = self.create_job_processor(json.loads(header))
+            except (ValueError, AttributeError) as error:
+                writer.write(f"{error}\n".encode("utf-8"))
+                return
+
+            writer.write(diagnostics.encode("utf-8"))
+            # The input is read by the job while it runs, so a queued job only holds its connection.
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+            await self.queue.put((processor, SocketReader(reader, loop), writer, done))
+            await done
+        finally:
+            writer.close()
+
+    async def run_jobs(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            processor, payload, writer, done = await self.queue.get()
+            try:
+                await loop.run_in_executor(self.executor, self.run_job, processor, payload, SocketStream(writer, loop))
+            except (ConnectionError, OSError) as error:
+                print(f"A job was stopped: {error}")
+            except Exception as error:
+                print(f"A job failed: {error}")
+                await payload.discard()
+                writer.write(f"The job failed: {error}\n".encode("utf-8"))
+            finally:
+                done.set_result(None)
+                self.queue.task_done()
+
+    @staticmethod
+    def run_job(processor, payload:SocketReader, stream:SocketStream):
+        if not processor.output_path:
+            processor.output_stream = stream
+        processor.diagnostics = stream
+        try:
+            if processor.input_path:
+                processor.load_data()
+            else:
+                processor.read_from_stream(payload)
+            processor.write_data()
+        finally:
+            processor.close()
+
+
+class SortClient:
+    """
+    Sends jobs to a SortServer.
+    """
+    block_size = 1 << 16
+
+    def __init__(self, socket_path:str = None):
+        """
+        :param socket_path: The path of the Unix socket. If empty, DEFAULT_SOCKET is used.
+        """
+        self.socket_path = socket_path or DEFAULT_SOCKET
+
+    @staticmethod
+    def create_header(datatype:str, output_type:str, options:ProcessorOptions, input_path:str = None,
+                      output_path:str = None) -> dict:
+        """
+        Creates the header of a job with the options of JOB_OPTIONS that differ from their default values,
+        so the other ones keep the values the daemon was started with.
+        """
+        header = {"dataType": datatype, "sortingType": output_type}
+        defaults = ProcessorOptions()
+        for name, (attribute, _) in JOB_OPTIONS.items():
+            value = getattr(options, attribute)
+            if value != getattr(defaults, attribute):
+                header[name] = value
+        if input_path:
+            header["inputFile"] = os.path.abspath(input_path)
+        if output_path:
+            header["outputFile"] = os.path.abspath(output_path)
+        return header
+
+    @staticmethod
+    def get_ignored_parameters(parameters:list[str]) -> list[str]:
+        """
+        Gets the command line parameters that cannot be sent in the header of a job.
+        """
+        supported = {"dataType", "sortingType", "inputFile", "outputFile", "client", "socket", *JOB_OPTIONS}
+        return [parameter for parameter in parameters if parameter.lstrip("-") not in supported]
+
+    def request(self, header:dict, payload, output):
+        """
+        Runs a job and writes its result as it arrives.
+        :param header: The settings of the job, see the module description.
+        :param payload: A binary stream with the input data, or None when the header has an inputFile.
+        :param output: A binary stream the result is written to.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(self.socket_path)
+            connection.sendall(json.dumps(header).encode("utf-8") + b"\n")
+            if payload is not None:
+                for block in iter(lambda: payload.read(self.block_size), b""):
+                    connection.sendall(block)
+            connection.shutdown(socket.SHUT_WR)
+
+            for data in iter(lambda: connection.recv(self.block_size), b""):
+                output.write(data)
+        output.flush()
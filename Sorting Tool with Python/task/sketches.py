@@ -0,0 +1,233 @@
+import heapq
+import math
+import random
+from operator import itemgetter
+
+
+class SpaceSaving:
+    """
+    Finds the most frequent items of a stream in bounded memory with the Space-Saving algorithm.
+    Each monitored item has an estimated count and the most it can exceed its true count, and every
+    item whose true count is greater than the floor (the greatest count evicted so far) is monitored.
+    The monitored items are pruned in batches, once twice the capacity is reached.
+    """
+    # Approximate amount of bytes used by a monitored item: its key, its count and error, and the dictionary entries.
+    entry_size = 256
+    default_memory = 64 << 20
+
+    def __init__(self, capacity:int):
+        """
+        :param capacity: The amount of items kept monitored after each pruning.
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.floor = 0
+        self.count = 0
+
+    @classmethod
+    def from_memory(cls, memory:int = None) -> "SpaceSaving":
+        """
+        Creates a summary whose monitored items fit in an amount of bytes.
+        :param memory: The memory budget in bytes. If empty, default_memory is used.
+        """
+        memory = memory or cls.default_memory
+        return cls(max(1, memory // (2 * cls.entry_size)))
+
+    def add(self, item):
+        self.count += 1
+        counts = self.counts
+        if item in counts:
+            counts[item] += 1
+            return
+
+        counts[item] = self.floor + 1
+        self.errors[item] = self.floor
+        if len(counts) >= 2 * self.capacity:
+            self.prune()
+
+    def add_all(self, items):
+        for item in items:
+            self.add(item)
+
+    def prune(self):
+        """
+        Keeps only the capacity items with the greatest counts, raising the floor to the greatest evicted count.
+        """
+        ranked = heapq.nlargest(self.capacity + 1, self.counts.items(), key=itemgetter(1))
+        if len(ranked) <= self.capacity:
+            return
+
+        self.floor = max(self.floor, ranked.pop()[1])
+        errors = self.errors
+        self.counts = dict(ranked)
+        self.errors = {item: errors[item] for item, _ in ranked}
+
+    def merge(self, other:"SpaceSaving"):
+        """
+        Registers all the items summarized by another SpaceSaving.
+        An item missing from one of the summaries may have occurred up to its floor times there.
+        """
+        counts = {}
+        errors = {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = self.counts.get(item, self.floor) + other.counts.get(item, other.floor)
+            errors[item] = self.errors.get(item, self.floor) + other.errors.get(item, other.floor)
+
+        self.counts = counts
+        self.errors = errors
+        self.floor += other.floor
+        self.count += other.count
+        if len(counts) > self.capacity:
+            self.prune()
+
+    def get_most_frequent(self, limit:int) -> list[tuple[int, object, int]]:
+        """
+        Gets the most frequent items as (count, item, error) tuples, sorted by count and then by the item itself.
+        The true count of each item is between count - error and count.
+        """
+        errors = self.errors
+        ranked = heapq.nlargest(limit, self.counts.items(), key=itemgetter(1))
+        return sorted((count, item, errors[item]) for item, count in ranked)
+
+
+class QuantileSketch:
+    """
+    Estimates the quantiles of a stream in bounded memory with a KLL-style sketch.
+    The items are kept in compactors of growing weight: when a compactor fills up, its items are sorted
+    and every other one moves to the next compactor with twice the weight. The capacities shrink
+    geometrically towards the lower compactors, so the memory grows only with the logarithm of the items.
+    """
+    shrink_rate = 2 / 3
+    min_capacity = 2
+
+    def __init__(self, size:int = 200, seed:int = 0):
+        """
+        :param size: The capacity of the top compactor. Larger sizes give more accurate quantiles.
+        :param seed: Seeds the choice of the items kept by each compaction, so the results are reproducible.
+        """
+        self.size = size
+        self.random = random.Random(seed)
+        self.compactors = [[]]
+        self.capacities = [size]
+        self.max_retained = size
+        self.retained = 0
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        # Each compaction of a compactor of weight w moves the rank of any value by -w, 0 or +w at random,
+        # so the errors add up like a random walk with this variance.
+        self.rank_variance = 0
+
+    def add_level(self):
+        self.compactors.append([])
+        height = len(self.compactors)
+        self.capacities = [max(self.min_capacity, int(self.size * self.shrink_rate ** (height - level - 1)))
+                           for level in range(height)]
+        self.max_retained = sum(self.capacities)
+
+    def add(self, item):
+        if self.count:
+            if item < self.minimum:
+                self.minimum = item
+            elif item > self.maximum:
+                self.maximum = item
+        else:
+            self.minimum = self.maximum = item
+        self.count += 1
+        self.retained += 1
+        self.compactors[0].append(item)
+        if self.retained > self.max_retained:
+            self.compress()
+
+    def add_all(self, items):
+        items = list(items)
+        if not items:
+            return
+
+        low = min(items)
+        high = max(items)
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        self.count += len(items)
+        self.retained += len(items)
+        self.compactors[0].extend(items)
+        self.compress()
+
+    def compress(self):
+        """
+        Compacts the lowest full compactors until the sketch fits its capacities again.
+        """
+        while self.retained > self.max_retained:
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) >= self.capacities[level]:
+                    self.compact(level)
+                    break
+
+    def compact(self, level:int):
+        if level + 1 == len(self.compactors):
+            self.add_level()
+
+        compactor = self.compactors[level]
+        compactor.sort()
+        # An odd item stays in the compactor, so the kept items represent exactly the removed ones.
+        kept = [compactor.pop()] if len(compactor) % 2 else []
+        promoted = compactor[self.random.randint(0, 1)::2]
+        self.compactors[level + 1].extend(promoted)
+        self.retained -= len(compactor) - len(promoted)
+        self.compactors[level] = kept
+        self.rank_variance += 1 << 2 * level
+
+    def merge(self, other:"QuantileSketch"):
+        """
+        Registers all the items summarized by another QuantileSketch.
+        """
+        if not other.count:
+            return
+
+        while len(self.compactors) < len(other.compactors):
+            self.add_level()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.retained += other.retained
+
+        self.count += other.count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.rank_variance += other.rank_variance
+        self.compress()
+
+    def get_rank_error(self, deviations:float = 2.576) -> float:
+        """
+        Gets the error of the estimated ranks, as a fraction of the items, that is not exceeded with high confidence.
+        :param deviations: How many standard deviations of the rank error are included. 2.576 gives a 99% confidence.
+        """
+        if not self.count:
+            return 0.0
+        return deviations * math.sqrt(self.rank_variance) / self.count
+
+    def get_quantiles(self, fractions:list[float]) -> list:
+        """
+        Estimates the items at some fractions of the ranks, using the nearest-rank definition.
+        The fractions 0 and 1 give the exact minimum and maximum.
+        :param fractions: Numbers between 0 and 1, like 0.5 for the median.
+        """
+        weighted = sorted((item, 1 << level) for level, compactor in enumerate(self.compactors)
+                          for item in compactor)
+        quantiles = []
+        for fraction in fractions:
+            if fraction <= 0:
+                quantiles.append(self.minimum)
+                continue
+            if fraction >= 1:
+                quantiles.append(self.maximum)
+                continue
+
+            rank = fraction * self.count
+            position = 0
+            for item, weight in weighted:
+                position += weight
+                if position >= rank:
+                    break
+            quantiles.append(item)
+        return quantiles
@@ -0,0 +1,248 @@
+import heapq
+from array import array
+from aggregates import MaxAggregate
+from algorithms import (count_range, count_values, counting_sort, is_narrow_range, iter_counts, radix_sort,
+                        select_values, walk_histogram)
+from frequency import FrequencyTable
+from validation import ProcessorAlgorithms
+
+
+class IntegerArray:
+    """
+    Stores integers compactly in a typed array of signed 64-bit values.
+    Values that do not fit in 64 bits are kept aside as Python integers.
+    """
+    # Amount of values sorted at once, so only that many are boxed as Python integers during the sort.
+    run_size = 1 << 20
+
+    def __init__(self):
+        self.values = array("q")
+        self.overflow = []
+        self.sorted_with = None
+        # The smallest and greatest 64-bit values, found once by sort().
+        self.value_range = None
+        self.sorted_runs = []
+        self.histogram = None
+        # The occurrences of each value of a narrow range, built by count_range for the counting sort.
+        self.range_counts = None
+
+    def __len__(self):
+        return len(self.values) + len(self.overflow)
+
+    def append(self, number:int):
+        try:
+            self.values.append(number)
+        except OverflowError:
+            self.overflow.append(number)
+
+    def extend(self, numbers):
+        """
+        Adds several numbers at once, copying them directly when they come in an array("q").
+        """
+        if isinstance(numbers, array):
+            self.values.extend(numbers)
+            return
+        for number in numbers:
+            self.append(number)
+
+    def get_range(self) -> tuple[int, int] | None:
+        """
+        Gets the smallest and the greatest of the 64-bit values, or None if there are no values.
+        """
+        if not self.values:
+            return None
+        return min(self.values), max(self.values)
+
+    def get_histogram(self):
+        """
+        Gets the occurrences of each 64-bit value, counting them on first use.
+        """
+        if self.histogram is None:
+            self.histogram = count_values(self.values)
+        return self.histogram
+
+    def choose_algorithm(self, algorithm:str, value_range:tuple[int, int] | None) -> str:
+        """
+        Resolves the automatic choice: counting sort for a narrow range of values, timsort otherwise.
+        Like the numpy engine, a counting sort requested for a wide range falls back to timsort,
+        since its histogram would be larger than the values.
+        """
+        narrow = value_range is not None and is_narrow_range(len(self.values), *value_range)
+        if algorithm == ProcessorAlgorithms.auto:
+            return ProcessorAlgorithms.counting if narrow else ProcessorAlgorithms.timsort
+        if algorithm == ProcessorAlgorithms.counting and not narrow:
+            return ProcessorAlgorithms.timsort
+        return algorithm
+
+    def sort(self, algorithm:str = ProcessorAlgorithms.auto):
+        """
+        Sorts the values with one of the ProcessorAlgorithms.
+        The timsort sorts the values in place as consecutive runs, which are merged while iterating.
+        The counting sort keeps the histogram of the range, which is walked in order while iterating.
+        """
+        self.overflow.sort()
+        value_range = self.value_range = self.get_range()
+        self.sorted_with = self.choose_algorithm(algorithm, value_range)
+        if not value_range:
+            self.sorted_runs = []
+        elif self.sorted_with == ProcessorAlgorithms.counting:
+            self.range_counts = count_range(self.values, *value_range)
+        elif self.sorted_with == ProcessorAlgorithms.radix:
+            self.values = radix_sort(self.values, *value_range)
+            self.sorted_runs = [(0, len(self.values))]
+        else:
+            self.sort_runs()
+
+    def sort_runs(self):
+        values = self.values
+        self.sorted_runs = []
+        for start in range(0, len(values), self.run_size):
+            end = min(start + self.run_size, len(values))
+            values[start:end] = array("q", sorted(values[start:end]))
+            self.sorted_runs.append((start, end))
+
+    def iter_sorted_values(self):
+        if self.sorted_with == ProcessorAlgorithms.counting and self.values:
+            return counting_sort(self.range_counts, self.value_range[0])
+
+        view = memoryview(self.values)
+        if len(self.sorted_runs) == 1:
+            return iter(view)
+        return heapq.merge(*(view[start:end] for start, end in self.sorted_runs))
+
+    def __iter__(self):
+        """
+        Iterates over the values. After sort() they come in natural order, since the values
+        below the 64-bit range are negative overflows and the values above it are positive ones.
+        """
+        if self.sorted_with is None:
+            yield from self.values
+            yield from self.overflow
+            return
+
+        yield from (number for number in self.overflow if number < 0)
+        yield from self.iter_sorted_values()
+        yield from (number for number in self.overflow if number > 0)
+
+    def select(self, ranks:list[int]) -> list[int]:
+        """
+        Picks the numbers at some positions of the natural order without sorting all of them:
+        a narrow range walks the histogram without expanding it, a wide one is selected in buckets.
+        :param ranks: The 0-based positions of the numbers, in increasing order.
+        """
+        below = sorted(number for number in self.overflow if number < 0)
+        above = sorted(number for number in self.overflow if number > 0)
+        inner = [rank - len(below) for rank in ranks if 0 <= rank - len(below) < len(self.values)]
+        inner_selected = []
+        if inner:
+            value_range = self.get_range()
+            if is_narrow_range(len(self.values), *value_range):
+                histogram = self.range_counts
+                if histogram is None:
+                    histogram = count_range(self.values, *value_range)
+                positions = walk_histogram(iter_counts(histogram, value_range[0]), inner)
+                inner_selected = [value for value, found in sorted(positions.items()) for _ in found]
+            else:
+                inner_selected = select_values(self.values, inner, *value_range)
+
+        selected = iter(inner_selected)
+        return [below[rank] if rank < len(below)
+                else next(selected) if rank < len(below) + len(self.values)
+                else above[rank - len(below) - len(self.values)]
+                for rank in ranks]
+
+    def get_frequencies(self) -> FrequencyTable:
+        """
+        Counts the occurrences of each number from the histogram of the values.
+        """
+        table = FrequencyTable()
+        table.add_counts(self.get_histogram())
+        table.add_all(self.overflow)
+        return table
+
+
+class DistinctStore:
+    """
+    Stores each distinct item once in a hash set, dropping the repeated items as they are processed,
+    so sorting only orders the distinct items.
+    """
+    def __init__(self):
+        self.items = set()
+        self.sorted_items = None
+        self.total = 0
+
+    def __len__(self):
+        """
+        Gets how many items were stored, including the repeated ones.
+        """
+        return self.total
+
+    def append(self, item):
+        self.items.add(item)
+        self.total += 1
+
+    def extend(self, items):
+        if not isinstance(items, (array, list, tuple)):
+            items = list(items)
+        self.items.update(items)
+        self.total += len(items)
+
+    def sort(self, algorithm:str = ProcessorAlgorithms.auto):
+        """
+        Sorts the distinct items. The algorithm is not used, since only the distinct items are sorted.
+        """
+        self.sorted_items = sorted(self.items)
+
+    def __iter__(self):
+        """
+        Iterates over the distinct items, in natural order after sort().
+        """
+        return iter(self.sorted_items if self.sorted_items is not None else self.items)
+
+
+class DictionaryStore:
+    """
+    Stores each distinct text item once, together with its amount of occurrences.
+    Sorting only orders the distinct items, which are expanded again while iterating.
+    """
+    def __init__(self):
+        self.table = FrequencyTable()
+        self.sorted_items = None
+
+    def __len__(self):
+        return self.table.total
+
+    def append(self, item):
+        self.table.add(item)
+
+    def extend(self, items):
+        self.table.add_all(items)
+
+    def sort(self):
+        self.sorted_items = sorted(self.table.counts)
+
+    def iter_counts(self):
+        """
+        Iterates over the (item, count) pairs, with the items in natural order after sort().
+        """
+        counts = self.table.counts
+        items = self.sorted_items if self.sorted_items is not None else counts
+        for item in items:
+            yield item, counts[item]
+
+    def __iter__(self):
+        for item, count in self.iter_counts():
+            for _ in range(count):
+                yield item
+
+    def get_frequencies(self) -> FrequencyTable:
+        return self.table
+
+    def get_summary(self, key) -> MaxAggregate:
+        """
+        Aggregates the maximum items by visiting only the distinct ones.
+        """
+        summary = MaxAggregate(key)
+        for item, count in self.iter_counts():
+            summary.add_group(item, count, count)
+        return summary
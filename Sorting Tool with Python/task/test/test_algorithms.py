@@ -0,0 +1,80 @@
+import random
+import unittest
+from array import array
+from algorithms import count_range, counting_sort, is_narrow_range, radix_sort
+from storage import IntegerArray
+
+
+class IntegerSortTest(unittest.TestCase):
+    """
+    Compares each sorting algorithm of IntegerArray with sorted() and checks the automatic choice between them.
+    """
+    def get_datasets(self) -> dict:
+        rng = random.Random(17)
+        permutation = list(range(-5000, 5000))
+        rng.shuffle(permutation)
+        return {
+            "empty": [],
+            "single": [7],
+            "repeated": [rng.randrange(-50, 50) for _ in range(20000)],
+            "permutation": permutation,
+            "wide": [rng.randrange(-10 ** 15, 10 ** 15) for _ in range(20000)],
+            "overflow": [rng.randrange(-100, 100) for _ in range(1000)] + [2 ** 70, -2 ** 70, 2 ** 64],
+        }
+
+    def sort_numbers(self, numbers:list[int], algorithm:str) -> IntegerArray:
+        items = IntegerArray()
+        items.extend(numbers)
+        items.sort(algorithm)
+        return items
+
+    def test_algorithms_match_sorted(self):
+        for name, numbers in self.get_datasets().items():
+            for algorithm in ("auto", "counting", "radix", "timsort"):
+                with self.subTest(dataset=name, algorithm=algorithm):
+                    self.assertEqual(sorted(numbers), list(self.sort_numbers(numbers, algorithm)))
+
+    def test_automatic_choice(self):
+        datasets = self.get_datasets()
+        expected = {"repeated": "counting", "permutation": "counting", "wide": "timsort", "overflow": "counting"}
+        for name, algorithm in expected.items():
+            with self.subTest(dataset=name):
+                self.assertEqual(algorithm, self.sort_numbers(datasets[name], "auto").sorted_with)
+
+    def test_counting_falls_back_for_wide_ranges(self):
+        items = self.sort_numbers(self.get_datasets()["wide"], "counting")
+        self.assertEqual("timsort", items.sorted_with)
+        self.assertIsNone(items.range_counts)
+
+    def test_counting_histogram_is_bounded_by_the_values(self):
+        numbers = self.get_datasets()["permutation"]
+        items = self.sort_numbers(numbers, "auto")
+        self.assertLessEqual(len(items.range_counts), max(len(numbers), 1 << 16))
+        self.assertIsNone(items.histogram)
+
+    def test_narrow_range(self):
+        self.assertTrue(is_narrow_range(1000, 0, 1 << 15))
+        self.assertTrue(is_narrow_range(1 << 20, -(1 << 19), (1 << 19) - 2))
+        self.assertFalse(is_narrow_range(1 << 20, 0, 1 << 20))
+
+    def test_helpers(self):
+        values = array("q", [5, -3, 5, 0, 2, -3, 5])
+        histogram = count_range(values, -3, 5)
+        self.assertEqual(9, len(histogram))
+        self.assertEqual(sorted(values), list(counting_sort(histogram, -3)))
+        self.assertEqual(sorted(values), list(radix_sort(values, -3, 5)))
+
+    def test_selection(self):
+        for name, numbers in self.get_datasets().items():
+            if not numbers:
+                continue
+            with self.subTest(dataset=name):
+                ranks = sorted({0, len(numbers) // 2, len(numbers) * 9 // 10, len(numbers) - 1})
+                items = IntegerArray()
+                items.extend(numbers)
+                ordered = sorted(numbers)
+                self.assertEqual([ordered[rank] for rank in ranks], items.select(ranks))
+
+
+if __name__ == "__main__":
+    unittest.main()
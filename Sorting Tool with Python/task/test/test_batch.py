@@ -0,0 +1,94 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from api import sort_files, sort_items
+from options import ProcessorOptions
+
+
+class BatchRunnerTest(unittest.TestCase):
+    """
+    Processes many files in worker processes and compares the combined result with the plain output of all of them.
+    """
+    inputs = [[f"{(index * 7919) % 503} w{index % 41} {part}" for index in range(2000)] for part in range(3)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_paths = []
+        for number, lines in enumerate(self.inputs):
+            input_path = os.path.join(self.directory.name, f"input{number}.txt")
+            with open(input_path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+            self.input_paths.append(input_path)
+        self.combined_path = os.path.join(self.directory.name, "combined.txt")
+        # The private directory of the temporary files, which must be left empty.
+        self.temp_directory = os.path.join(self.directory.name, "temp")
+        os.mkdir(self.temp_directory)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_options(self, **options) -> ProcessorOptions:
+        return ProcessorOptions(workers=2, temp_directory=self.temp_directory, **options)
+
+    def read_output(self, input_path:str) -> str:
+        with open(input_path + ".sorted", encoding="utf-8") as file:
+            return file.read()
+
+    def sort_combined(self, input_paths:list[str], datatype:str, output:str, options:ProcessorOptions = None) -> str:
+        with redirect_stdout(io.StringIO()):
+            sort_files(input_paths, datatype, output, options or self.get_options(),
+                       combined_path=self.combined_path)
+        with open(self.combined_path, encoding="utf-8") as file:
+            return file.read()
+
+    def test_combined_result_matches_the_serial_output(self):
+        lines = [line for part in self.inputs for line in part]
+        cases = [(datatype, output) for datatype in ("long", "word", "line") for output in ("natural", "byCount")]
+        cases += [("long", "summary"), ("long", "percentiles")]
+        for datatype, output in cases:
+            for memory_limit in (None, 4096):
+                with self.subTest(datatype=datatype, output=output, memory_limit=memory_limit):
+                    expected = sort_items(lines, datatype, output, diagnostics=io.StringIO())
+                    options = self.get_options(memory_limit=memory_limit)
+                    self.assertEqual(expected, self.sort_combined(self.input_paths, datatype, output, options))
+                    for part, input_path in zip(self.inputs, self.input_paths):
+                        self.assertEqual(sort_items(part, datatype, output, diagnostics=io.StringIO()),
+                                         self.read_output(input_path))
+                    self.assertFalse(os.listdir(self.temp_directory))
+
+    def test_unique_combined_result(self):
+        lines = [line for part in self.inputs for line in part]
+        options = self.get_options(unique=True)
+        expected = sort_items(lines, "word", options=options, diagnostics=io.StringIO())
+        self.assertEqual(expected, self.sort_combined(self.input_paths, "word", "natural", options))
+        for part, input_path in zip(self.inputs, self.input_paths):
+            self.assertEqual(sort_items(part, "word", options=options, diagnostics=io.StringIO()),
+                             self.read_output(input_path))
+
+    def test_invalid_types(self):
+        for datatype, output in (("float", "natural"), ("word", "reversed")):
+            with self.subTest(datatype=datatype, output=output):
+                with self.assertRaises(ValueError):
+                    sort_files(self.input_paths, datatype, output, self.get_options())
+        self.assertFalse(os.path.exists(self.input_paths[0] + ".sorted"))
+
+    def test_failed_file_is_reported(self):
+        failed_path = os.path.join(self.directory.name, "failed.txt")
+        with open(failed_path, "wb") as file:
+            file.write(b"\xff\xfe\n")
+
+        console = io.StringIO()
+        with redirect_stdout(console):
+            sort_files([self.input_paths[0], failed_path], "word", "natural", self.get_options(),
+                       combined_path=self.combined_path)
+        with open(self.combined_path, encoding="utf-8") as file:
+            result = file.read()
+        self.assertEqual(sort_items(self.inputs[0], "word", diagnostics=io.StringIO()), result)
+        self.assertTrue(console.getvalue().startswith(f"{failed_path}: The file failed: "))
+        self.assertFalse(os.listdir(self.temp_directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
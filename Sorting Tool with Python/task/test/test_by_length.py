@@ -0,0 +1,57 @@
+import io
+import os
+import tempfile
+import unittest
+from collections import Counter
+from api import create_processor, sort_items
+from options import ProcessorOptions
+
+LINES = [f"{(index * 7919) % 100003 - 50000} {'é' * (index % 9)}w{index % 101}" if index % 13 else ""
+         for index in range(3000)]
+
+
+class ByLengthOutputTest(unittest.TestCase):
+    """
+    Compares the byLength output with the lengths of the items counted by a Counter.
+    The length of a number is its amount of digits, without the sign.
+    """
+    inputs = {
+        "long": ("number", lambda line: [len(token.lstrip("-")) for token in line.split()
+                                         if token.lstrip("-").isdigit()]),
+        "word": ("word", lambda line: [len(word) for word in line.split()]),
+        "line": ("line", lambda line: [len(line)]),
+    }
+
+    def get_expected(self, datatype:str) -> str:
+        item_type, get_lengths = self.inputs[datatype]
+        lengths = Counter(length for line in LINES for length in get_lengths(line))
+        total = lengths.total()
+        return (f"Total {item_type}s: {total}.\n"
+                + "".join(f"Length {length}: {count} {item_type}(s), {int(count * 100 / total)}%\n"
+                          for length, count in sorted(lengths.items())))
+
+    def test_in_memory(self):
+        for datatype in self.inputs:
+            with self.subTest(datatype=datatype):
+                self.assertEqual(self.get_expected(datatype),
+                                 sort_items(LINES, datatype, "byLength", diagnostics=io.StringIO()))
+
+    def test_parallel_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.txt")
+            with open(input_path, "w", encoding="utf-8") as file:
+                file.write("\n".join(LINES) + "\n")
+            for datatype in self.inputs:
+                with self.subTest(datatype=datatype):
+                    options = ProcessorOptions(workers=2, batch_size=4096)
+                    processor = create_processor(datatype, "byLength", input_path, options=options)
+                    stream = io.StringIO()
+                    processor.output_stream = stream
+                    processor.diagnostics = io.StringIO()
+                    processor.load_data()
+                    processor.write_data()
+                    self.assertEqual(self.get_expected(datatype), stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from api import create_processor, sort_items
+from cache import ResultCache
+from options import ProcessorOptions
+
+
+def count_hits(directory:str, amount:int):
+    cache = ResultCache(directory)
+    for _ in range(amount):
+        cache.count("hits")
+
+
+class ResultCacheTest(unittest.TestCase):
+    """
+    Processes input files through a cache directory and compares the results with the plain output.
+    """
+    lines = [f"{(index * 7919) % 503} w{index % 41} x{index}" for index in range(2000)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, "cache")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_input(self, name:str, lines:list[str]) -> str:
+        input_path = os.path.join(self.directory.name, name)
+        with open(input_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+        return input_path
+
+    def sort_cached(self, input_path:str, datatype:str = "long", output:str = "natural",
+                    options:ProcessorOptions = None) -> tuple[str, str]:
+        """
+        :return: The output and the diagnostic messages.
+        """
+        options = options or ProcessorOptions(cache_directory=self.cache_directory)
+        processor = create_processor(datatype, output, input_path, options=options)
+        stream = io.StringIO()
+        diagnostics = io.StringIO()
+        processor.output_stream = stream
+        processor.diagnostics = diagnostics
+        processor.load_data()
+        processor.write_data()
+        return stream.getvalue(), diagnostics.getvalue()
+
+    def get_stats(self) -> dict:
+        return ResultCache(self.cache_directory).get_stats()
+
+    def test_miss_then_hit(self):
+        input_path = self.write_input("input.txt", self.lines)
+        for datatype in ("long", "word", "line"):
+            with self.subTest(datatype=datatype):
+                diagnostics = io.StringIO()
+                expected = sort_items(self.lines, datatype, "byCount", diagnostics=diagnostics)
+                self.assertEqual((expected, diagnostics.getvalue()), self.sort_cached(input_path, datatype, "byCount"))
+                self.assertEqual((expected, diagnostics.getvalue()), self.sort_cached(input_path, datatype, "byCount"))
+
+        stats = self.get_stats()
+        self.assertEqual((3, 3, 3), (stats["hits"], stats["misses"], stats["entries"]))
+
+    def test_replayed_errors(self):
+        input_path = self.write_input("input.txt", self.lines)
+        first = self.sort_cached(input_path)
+        second = self.sort_cached(input_path)
+        self.assertEqual(first, second)
+        self.assertTrue(second[1].startswith("\"w0\" is not a long. It will be skipped.\n"))
+        self.assertEqual(1, self.get_stats()["hits"])
+
+    def test_changed_input_misses(self):
+        input_path = self.write_input("input.txt", self.lines)
+        self.sort_cached(input_path, "word")
+        self.write_input("input.txt", self.lines[1:])
+        self.assertEqual(sort_items(self.lines[1:], "word", diagnostics=io.StringIO()),
+                         self.sort_cached(input_path, "word")[0])
+        self.assertEqual((0, 2), (self.get_stats()["hits"], self.get_stats()["misses"]))
+
+    def test_least_recently_used_results_are_evicted(self):
+        input_paths = [self.write_input(f"input{part}.txt", [f"{line} {part}" for line in self.lines])
+                       for part in range(3)]
+        self.sort_cached(input_paths[0], "word")
+        entry_size = self.get_stats()["size"]
+
+        options = ProcessorOptions(cache_directory=self.cache_directory, cache_size=entry_size * 2 + entry_size // 2)
+        for part in (1, 0, 2):
+            # The file times are coarse, so the uses are spaced out to be ordered by them.
+            time.sleep(0.05)
+            self.sort_cached(input_paths[part], "word", options=options)
+        self.assertEqual(2, self.get_stats()["entries"])
+
+        # The second input was the least recently used, so only it is processed again.
+        self.sort_cached(input_paths[0], "word", options=options)
+        self.sort_cached(input_paths[1], "word", options=options)
+        stats = self.get_stats()
+        self.assertEqual((2, 4), (stats["hits"], stats["misses"]))
+
+    def test_bypass(self):
+        input_path = self.write_input("input.txt", self.lines)
+        self.sort_cached(input_path, "word")
+        options = ProcessorOptions(cache_directory=self.cache_directory, cache_bypass=True)
+        self.write_input("input.txt", self.lines[:10])
+        self.assertEqual(sort_items(self.lines[:10], "word", diagnostics=io.StringIO()),
+                         self.sort_cached(input_path, "word", options=options)[0])
+        stats = self.get_stats()
+        self.assertEqual((0, 1, 1), (stats["hits"], stats["misses"], stats["entries"]))
+
+    def test_failed_output_is_not_cached(self):
+        class FailingStream(io.StringIO):
+            def flush(self):
+                raise OSError("No space left on device")
+
+        input_path = self.write_input("input.txt", self.lines)
+        processor = create_processor("word", "natural", input_path,
+                                     options=ProcessorOptions(cache_directory=self.cache_directory))
+        processor.output_stream = FailingStream()
+        processor.diagnostics = io.StringIO()
+        processor.load_data()
+        with self.assertRaises(OSError):
+            processor.write_data()
+        self.assertEqual(["misses.count"], os.listdir(self.cache_directory))
+
+    def test_counters_of_concurrent_runs(self):
+        with ProcessPoolExecutor(4) as executor:
+            list(executor.map(count_hits, [self.cache_directory] * 8, [250] * 8))
+        self.assertEqual(2000, self.get_stats()["hits"])
+
+
+if __name__ == "__main__":
+    unittest.main()
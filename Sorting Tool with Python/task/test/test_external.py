@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+from api import create_processor, sort_file, sort_items
+from external import ExternalSorter, SpilledRun
+from options import ProcessorOptions
+from vectorized import NumpyIntegerStore
+
+
+class ExternalSorterTest(unittest.TestCase):
+    """
+    Spills items to sorted runs on disk and merges them back.
+    """
+    def test_spills_and_merges_runs(self):
+        sorter = ExternalSorter(200, str, int)
+        numbers = [(index * 7919) % 1000 for index in range(1000)]
+        for number in numbers:
+            sorter.add(number)
+        try:
+            self.assertTrue(sorter.runs)
+            self.assertEqual(len(numbers), len(sorter))
+            self.assertEqual(sorted(numbers), list(sorter))
+        finally:
+            sorter.close()
+
+    def test_more_runs_than_the_fan_in(self):
+        sorter = ExternalSorter(100, str, int)
+        sorter.max_fan_in = 4
+        numbers = [(index * 7919) % 1000 for index in range(1000)]
+        for number in numbers[:500]:
+            sorter.add(number)
+        for start in range(500, 1000, 50):
+            sorter.adopt_run(SpilledRun.write(sorted(numbers[start:start + 50]), 50))
+        try:
+            self.assertGreater(len(sorter.runs) + len(sorter.adopted), 4 * 4)
+            open_files = self.count_open_files()
+            items = iter(sorter)
+            self.assertEqual(sorted(numbers)[0], next(items))
+            if open_files is not None:
+                self.assertLessEqual(self.count_open_files(), open_files + sorter.max_fan_in)
+            self.assertLessEqual(len(sorter.runs) + len(sorter.adopted), sorter.max_fan_in)
+            self.assertEqual(sorted(numbers)[1:], list(items))
+            self.assertEqual(len(numbers), len(sorter))
+        finally:
+            sorter.close()
+
+    @staticmethod
+    def count_open_files() -> int | None:
+        """
+        Counts the file descriptors of the process, or None where /proc is not available.
+        """
+        if not os.path.isdir("/proc/self/fd"):
+            return None
+        return len(os.listdir("/proc/self/fd"))
+
+    def test_processor_spills_past_the_memory_limit(self):
+        processor = create_processor("line", "natural", options=ProcessorOptions(memory_limit=100))
+        processor.diagnostics = io.StringIO()
+        try:
+            processor.load_lines(f"line {index}" for index in range(1000))
+            self.assertTrue(processor.sorter.runs)
+            self.assertEqual(1000, len(processor.sorter))
+            self.assertFalse(processor.items)
+        finally:
+            processor.close()
+
+    @unittest.skipUnless(NumpyIntegerStore.is_available(), "NumPy is not installed")
+    def test_numpy_engine_spills_past_the_memory_limit(self):
+        lines = [f"{(index * 7919) % 5003} -{index}" for index in range(3000)]
+        options = ProcessorOptions(memory_limit=4096, engine="numpy")
+        processor = create_processor("long", "natural", options=options)
+        processor.diagnostics = io.StringIO()
+        try:
+            processor.load_lines(lines)
+            self.assertFalse(processor.vectorized)
+            self.assertTrue(processor.sorter.runs)
+        finally:
+            processor.close()
+        self.assertEqual(sort_items(lines, "long"), sort_items(lines, "long", options=options))
+
+    def test_spilled_output_matches_the_serial_output(self):
+        lines = [f"{(index * 7919) % 5003} {index % 17} x" for index in range(3000)]
+        for datatype in ("long", "word", "line"):
+            for output in ("natural", "byCount", "summary"):
+                with self.subTest(datatype=datatype, output=output):
+                    expected = sort_items(lines, datatype, output, diagnostics=io.StringIO())
+                    spilled = sort_items(lines, datatype, output, ProcessorOptions(memory_limit=4096),
+                                         diagnostics=io.StringIO())
+                    self.assertEqual(expected, spilled)
+
+    def test_workers_hand_over_spilled_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.txt")
+            with open(input_path, "w", encoding="utf-8") as file:
+                file.writelines(f"{(index * 7919) % 100003} {index % 13}\n" for index in range(60000))
+
+            results = []
+            for options in (ProcessorOptions(), ProcessorOptions(workers=2, memory_limit=1 << 16)):
+                output_path = os.path.join(directory, "output.txt")
+                sort_file(input_path, output_path, "long", "natural", options)
+                with open(output_path, encoding="utf-8") as file:
+                    results.append(file.read())
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(["input.txt", "output.txt"], sorted(os.listdir(directory)))
+            self.assertFalse([name for name in os.listdir(tempfile.gettempdir()) if name.endswith(".run")])
+
+
+if __name__ == "__main__":
+    unittest.main()
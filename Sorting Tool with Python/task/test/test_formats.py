@@ -0,0 +1,49 @@
+import io
+import unittest
+from api import create_processor, sort_items, write_items
+from formats import BinaryReader
+from options import ProcessorOptions
+
+NUMBERS = [(index * 7919) % 100003 - 50000 for index in range(5000)]
+LINES = [" ".join(map(str, NUMBERS[start:start + 10])) for start in range(0, len(NUMBERS), 10)]
+
+
+class BinaryFormatsTest(unittest.TestCase):
+    """
+    Writes the natural output as 64-bit values and reads it back.
+    """
+    def write_binary(self, options:ProcessorOptions) -> io.BytesIO:
+        data = io.BytesIO()
+        stream = io.TextIOWrapper(data, encoding="utf-8", write_through=True)
+        write_items(LINES, stream, "long", "natural", options, io.StringIO())
+        stream.detach()
+        data.seek(0)
+        return data
+
+    def test_round_trip(self):
+        for output_format in ("binary", "npy"):
+            for memory_limit in (None, 4096):
+                with self.subTest(output_format=output_format, memory_limit=memory_limit):
+                    options = ProcessorOptions(output_format=output_format, memory_limit=memory_limit)
+                    data = self.write_binary(options)
+                    values = [value for block in BinaryReader(data, output_format == "npy") for value in block]
+                    self.assertEqual(sorted(NUMBERS), values)
+
+    def test_binary_input_matches_the_text_input(self):
+        data = self.write_binary(ProcessorOptions(output_format="npy"))
+        processor = create_processor("long", "summary", options=ProcessorOptions(input_format="npy"))
+        processor.output_stream = io.StringIO()
+        try:
+            processor.read_from_stream(data)
+            processor.write_data()
+        finally:
+            processor.close()
+        self.assertEqual(sort_items(LINES, "long", "summary"), processor.output_stream.getvalue())
+
+    def test_text_only_stream_is_rejected(self):
+        with self.assertRaises(ValueError):
+            sort_items(LINES, "long", "natural", ProcessorOptions(output_format="npy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
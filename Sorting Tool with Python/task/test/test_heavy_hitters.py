@@ -0,0 +1,58 @@
+import io
+import random
+import unittest
+from collections import Counter
+from api import sort_items
+from options import ProcessorOptions
+from sketches import SpaceSaving
+
+
+class HeavyHittersTest(unittest.TestCase):
+    """
+    Checks the counts of the approximate byCount output against the true counts.
+    """
+    def get_items(self, seed:int, amount:int) -> list[str]:
+        rng = random.Random(seed)
+        return [f"w{int(rng.paretovariate(1.2))}" for _ in range(amount)]
+
+    def assert_bounds(self, summary:SpaceSaving, items:list[str]):
+        counts = Counter(items)
+        for count, item, error in summary.get_most_frequent(len(summary.counts)):
+            self.assertLessEqual(count - error, counts[item])
+            self.assertLessEqual(counts[item], count)
+        monitored = summary.counts.keys()
+        for item, count in counts.items():
+            if count > summary.floor:
+                self.assertIn(item, monitored)
+
+    def test_count_bounds(self):
+        items = self.get_items(3, 50000)
+        summary = SpaceSaving(50)
+        summary.add_all(items)
+        self.assertLess(len(summary.counts), 100)
+        self.assertGreater(summary.floor, 0)
+        self.assert_bounds(summary, items)
+
+    def test_merged_count_bounds(self):
+        items = self.get_items(7, 40000)
+        merged = SpaceSaving(50)
+        for start in range(0, len(items), 10000):
+            part = SpaceSaving(50)
+            part.add_all(items[start:start + 10000])
+            merged.merge(part)
+        self.assertEqual(len(items), merged.count)
+        self.assert_bounds(merged, items)
+
+    def test_output_contains_the_most_frequent_items(self):
+        items = self.get_items(5, 20000)
+        lines = [" ".join(items[start:start + 10]) for start in range(0, len(items), 10)]
+        options = ProcessorOptions(approx=True, approx_memory=SpaceSaving.entry_size * 100, limit=5)
+        result = sort_items(lines, "word", "byCount", options, io.StringIO()).splitlines()
+        self.assertEqual(f"Total words: {len(items)}.", result[0])
+        self.assertTrue(result[1].startswith("The 5 most frequent words are approximate"))
+        expected = sorted(item for item, _ in Counter(items).most_common(5))
+        self.assertEqual(expected, sorted(line.split(":")[0] for line in result[2:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
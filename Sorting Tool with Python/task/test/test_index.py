@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from api import create_processor, sort_items
+from options import ProcessorOptions
+
+
+class SortedIndexTest(unittest.TestCase):
+    """
+    Merges inputs into an index file and compares the output with the plain output of all the inputs together.
+    """
+    inputs = [[f"{(index * 7919) % 503} w{index % 41} {part}" for index in range(2000)] for part in range(3)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.directory.name, "items.index")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sort_indexed(self, lines:list[str], datatype:str, output:str, index_path:str = None) -> tuple[str, str]:
+        """
+        :return: The output and the diagnostic messages.
+        """
+        input_path = os.path.join(self.directory.name, "input.txt")
+        with open(input_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+
+        options = ProcessorOptions(index_path=index_path or self.index_path)
+        stream = io.StringIO()
+        diagnostics = io.StringIO()
+        with redirect_stdout(diagnostics):
+            processor = create_processor(datatype, output, input_path, options=options)
+        processor.output_stream = stream
+        processor.diagnostics = diagnostics
+        processor.load_data()
+        processor.write_data()
+        return stream.getvalue(), diagnostics.getvalue()
+
+    def test_merged_inputs_match_the_serial_output(self):
+        for datatype in ("long", "word", "line"):
+            for output in ("natural", "byCount", "summary"):
+                with self.subTest(datatype=datatype, output=output):
+                    index_path = os.path.join(self.directory.name, f"{datatype}-{output}.index")
+                    lines = []
+                    for part in self.inputs:
+                        lines += part
+                        result, _ = self.sort_indexed(part, datatype, output, index_path)
+                    self.assertEqual(sort_items(lines, datatype, output, diagnostics=io.StringIO()), result)
+
+    def test_merged_lines(self):
+        options = ProcessorOptions(index_path=self.index_path)
+        lines = []
+        for part in self.inputs:
+            lines += part
+            result = sort_items(part, "word", "byCount", options, diagnostics=io.StringIO())
+        self.assertEqual(sort_items(lines, "word", "byCount", diagnostics=io.StringIO()), result)
+
+    def test_unsupported_sorting_type_ignores_the_index(self):
+        result, diagnostics = self.sort_indexed(self.inputs[0], "long", "top")
+        self.assertEqual(sort_items(self.inputs[0], "long", "top", diagnostics=io.StringIO()), result)
+        self.assertTrue(diagnostics.startswith("The index only supports the natural, byCount and summary sorting types."))
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_index_of_other_items_has_no_output(self):
+        self.sort_indexed(self.inputs[0], "word", "natural")
+        result, diagnostics = self.sort_indexed(self.inputs[0], "long", "summary")
+        self.assertEqual("", result)
+        self.assertIn("is not an index of numbers.", diagnostics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from api import create_processor, sort_items
+from options import ProcessorOptions
+from parallel import ChunkPool
+from vectorized import NumpyIntegerStore
+
+
+class ProcessingModesTest(unittest.TestCase):
+    """
+    Compares the output of each way of reading and processing the input with the plain serial output.
+    """
+    lines = [f"{(index * 7919) % 1009 - 500} w{index % 53} {'é' if index % 11 else 'x'}{index % 7}"
+             for index in range(3000)]
+    cases = [(datatype, output) for datatype in ("long", "word", "line")
+             for output in ("natural", "byCount", "summary", "top", "bottom", "byLength")]
+    cases.append(("long", "percentiles"))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "input.txt")
+        with open(self.input_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(self.lines) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sort_input(self, datatype:str, output:str, options:ProcessorOptions, from_file:bool) -> str:
+        """
+        Sorts the input file, read by load_data when from_file,
+        or as a stream like the standard input otherwise.
+        """
+        stream = io.StringIO()
+        with redirect_stdout(io.StringIO()):
+            processor = create_processor(datatype, output, self.input_path, options=options)
+        processor.output_stream = stream
+        processor.diagnostics = io.StringIO()
+        if from_file:
+            processor.load_data()
+        else:
+            with open(self.input_path, "rb") as file:
+                processor.read_from_stream(file)
+        processor.write_data()
+        return stream.getvalue()
+
+    def assert_modes(self, modes:dict):
+        for datatype, output in self.cases:
+            expected = sort_items(self.lines, datatype, output, diagnostics=io.StringIO())
+            for name, (options, from_file) in modes.items():
+                with self.subTest(datatype=datatype, output=output, mode=name):
+                    self.assertEqual(expected, self.sort_input(datatype, output, options(), from_file))
+
+    def test_file_and_stream(self):
+        self.assert_modes({
+            "file": (ProcessorOptions, True),
+            "stream": (ProcessorOptions, False),
+            "pipeline": (lambda: ProcessorOptions(pipeline_depth=2, batch_size=4096), False),
+        })
+
+    def test_workers(self):
+        with mock.patch.object(ChunkPool, "chunk_size", 1 << 13):
+            self.assert_modes({
+                "workers": (lambda: ProcessorOptions(workers=2), True),
+                "spilled workers": (lambda: ProcessorOptions(workers=2, memory_limit=4096), False),
+            })
+
+    def test_lines_in_workers(self):
+        for datatype, output in self.cases:
+            expected = sort_items(self.lines, datatype, output, diagnostics=io.StringIO())
+            for options in (ProcessorOptions(workers=2), ProcessorOptions(workers=2, memory_limit=4096)):
+                with self.subTest(datatype=datatype, output=output, memory_limit=options.memory_limit):
+                    with (mock.patch.object(ChunkPool, "chunk_size", 1 << 13),
+                          mock.patch.object(ChunkPool, "map", autospec=True, side_effect=ChunkPool.map) as pool_map):
+                        result = sort_items(self.lines, datatype, output, options, diagnostics=io.StringIO())
+                    self.assertEqual(expected, result)
+                    self.assertTrue(pool_map.called)
+
+    def test_standard_input_without_buffer(self):
+        class InputMock:
+            """
+            A text standard input without a byte stream under it, like the one of a test harness.
+            """
+            def __init__(self, text:str):
+                self.lines = io.StringIO(text)
+
+            def readline(self) -> str:
+                line = self.lines.readline()
+                if not line:
+                    raise EOFError
+                return line
+
+        for datatype, output in self.cases:
+            with self.subTest(datatype=datatype, output=output):
+                stream = io.StringIO()
+                with redirect_stdout(io.StringIO()):
+                    processor = create_processor(datatype, output)
+                processor.output_stream = stream
+                processor.diagnostics = io.StringIO()
+                with mock.patch("sys.stdin", InputMock("\n".join(self.lines) + "\n")):
+                    processor.load_data()
+                processor.write_data()
+                self.assertEqual(sort_items(self.lines, datatype, output, diagnostics=io.StringIO()),
+                                 stream.getvalue())
+
+    @unittest.skipUnless(NumpyIntegerStore.is_available(), "NumPy is not installed")
+    def test_numpy_engine(self):
+        self.assert_modes({
+            "numpy": (lambda: ProcessorOptions(engine="numpy"), True),
+            "numpy stream": (lambda: ProcessorOptions(engine="numpy", batch_size=4096), False),
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import io
+import math
+import random
+import unittest
+from contextlib import redirect_stdout
+from api import create_processor, sort_items
+from options import ProcessorOptions
+from sketches import QuantileSketch
+from storage import IntegerArray
+from vectorized import NumpyIntegerStore
+
+
+class PercentilesTest(unittest.TestCase):
+    """
+    Compares the percentiles output with the nearest-rank percentiles of the sorted numbers.
+    """
+    fractions = (0.0, 0.5, 0.9, 0.99, 1.0)
+
+    def get_lines(self, numbers:list[int]) -> list[str]:
+        return [" ".join(map(str, numbers[start:start + 7])) for start in range(0, len(numbers), 7)]
+
+    def get_expected(self, numbers:list[int]) -> list[int]:
+        ordered = sorted(numbers)
+        return [ordered[max(math.ceil(fraction * len(ordered)), 1) - 1] for fraction in self.fractions]
+
+    def get_percentiles(self, numbers:list[int], options:ProcessorOptions) -> list[int]:
+        result = sort_items(self.get_lines(numbers), "long", "percentiles", options, io.StringIO())
+        lines = result.splitlines()
+        self.assertEqual(f"Total numbers: {len(numbers)}.", lines[0])
+        return [int(line.rsplit(": ", 1)[1]) for line in lines[-len(self.fractions):]]
+
+    def test_exact_percentiles(self):
+        rng = random.Random(7)
+        datasets = {
+            "wide": [rng.randrange(-10 ** 15, 10 ** 15) for _ in range(20000)],
+            "narrow": [rng.randrange(100) for _ in range(20000)],
+            "skewed": [int(rng.lognormvariate(3, 3)) for _ in range(20000)],
+            "overflow": [rng.randrange(1000) for _ in range(2000)] + [2 ** 70, -2 ** 70, 2 ** 80],
+        }
+        settings = [ProcessorOptions(), ProcessorOptions(memory_limit=4096)]
+        if NumpyIntegerStore.is_available():
+            settings.append(ProcessorOptions(engine="numpy"))
+        for name, numbers in datasets.items():
+            for options in settings:
+                with self.subTest(dataset=name, engine=options.engine, memory_limit=options.memory_limit):
+                    self.assertEqual(self.get_expected(numbers), self.get_percentiles(numbers, options))
+
+    def test_spilled_runs_are_merged(self):
+        numbers = [(index * 7919) % 10007 for index in range(20000)]
+        processor = create_processor("long", "percentiles", options=ProcessorOptions(memory_limit=4096))
+        processor.diagnostics = io.StringIO()
+        try:
+            processor.load_lines(self.get_lines(numbers))
+            self.assertTrue(processor.sorter.runs)
+            ranks = [max(math.ceil(fraction * len(numbers)), 1) - 1 for fraction in self.fractions]
+            self.assertEqual(self.get_expected(numbers), processor.select_ranks(ranks))
+        finally:
+            processor.close()
+
+    def test_selection_of_integer_array(self):
+        rng = random.Random(3)
+        for maximum in (10, 10 ** 4, 10 ** 18):
+            with self.subTest(maximum=maximum):
+                numbers = [rng.randrange(-maximum, maximum) for _ in range(5000)]
+                items = IntegerArray()
+                items.extend(numbers)
+                ranks = [0, 1, 2499, 4500, 4950, 4998, 4999]
+                ordered = sorted(numbers)
+                self.assertEqual([ordered[rank] for rank in ranks], items.select(ranks))
+
+    def test_approximate_rank_error(self):
+        rng = random.Random(11)
+        numbers = [rng.randrange(10 ** 9) for _ in range(100000)]
+        ordered = sorted(numbers)
+        sketch = QuantileSketch(200)
+        for number in numbers:
+            sketch.add(number)
+        self.assertLess(sketch.retained, 1000)
+        self.assertEqual((ordered[0], ordered[-1]), (sketch.minimum, sketch.maximum))
+
+        fractions = [index / 20 for index in range(1, 20)]
+        for fraction, estimate in zip(fractions, sketch.get_quantiles(fractions)):
+            rank = ordered.index(estimate) / len(ordered)
+            self.assertLess(abs(rank - fraction), sketch.get_rank_error() * 1.5)
+
+    def test_merged_sketches(self):
+        rng = random.Random(5)
+        numbers = [rng.random() for _ in range(40000)]
+        merged = QuantileSketch(200)
+        for start in range(0, len(numbers), 10000):
+            part = QuantileSketch(200)
+            part.add_all(numbers[start:start + 10000])
+            merged.merge(part)
+        self.assertEqual(len(numbers), merged.count)
+        median, = merged.get_quantiles([0.5])
+        self.assertLess(abs(sorted(numbers).index(median) / len(numbers) - 0.5), merged.get_rank_error() * 1.5)
+
+    def test_only_for_long_data(self):
+        messages = io.StringIO()
+        with redirect_stdout(messages):
+            self.assertEqual("", sort_items(["b a"], "word", "percentiles"))
+        self.assertIn("only supported for the long data type", messages.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from api import create_processor, sort_items
+from main import main
+from options import ProcessorOptions
+
+
+class ProfilingTest(unittest.TestCase):
+    """
+    Runs with the profiling report enabled, checking the report and that the output is unchanged.
+    """
+    lines = [f"{(index * 7919) % 1009 - 500} w{index % 53} x" for index in range(3000)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "input.txt")
+        with open(self.input_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(self.lines) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_report(self, report:dict, items:int):
+        self.assertEqual(items, report["items"])
+        self.assertGreater(report["total_time"], 0)
+        self.assertIn("write", report["phases"])
+        self.assertTrue(all(time >= 0 for time in report["phases"].values()))
+
+    def test_command_line_report(self):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            main(["-dataType", "long", "-sortingType", "natural", "-inputFile", self.input_path, "-profile"])
+
+        diagnostics = io.StringIO()
+        expected = sort_items(self.lines, "long", diagnostics=diagnostics)
+        self.assertEqual(diagnostics.getvalue() + expected, stdout.getvalue())
+        report = json.loads(stderr.getvalue())
+        self.assert_report(report, 3000)
+        self.assertEqual(6000, report["counters"]["invalid_tokens"])
+
+    def test_report_and_cprofile_files(self):
+        for datatype in ("long", "word", "line"):
+            for output in ("natural", "byCount", "top"):
+                with self.subTest(datatype=datatype, output=output):
+                    report_path = os.path.join(self.directory.name, f"{datatype}-{output}.json")
+                    cprofile_path = os.path.join(self.directory.name, f"{datatype}-{output}.prof")
+                    options = ProcessorOptions(profile=report_path, cprofile_path=cprofile_path)
+                    processor = create_processor(datatype, output, self.input_path, options=options)
+                    stream = io.StringIO()
+                    processor.output_stream = stream
+                    processor.diagnostics = io.StringIO()
+                    processor.load_data()
+                    processor.write_data()
+
+                    expected = sort_items(self.lines, datatype, output, diagnostics=io.StringIO())
+                    self.assertEqual(expected, stream.getvalue())
+                    with open(report_path, encoding="utf-8") as file:
+                        self.assert_report(json.load(file), processor.get_total())
+                    self.assertTrue(pstats.Stats(cprofile_path).total_calls > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import os
+import tempfile
+import unittest
+from api import create_processor, sort_items
+from options import ProcessorOptions
+
+NUMBERS = [str((index * 7919) % 211 - 100) for index in range(3000)]
+WORDS = [f"w{'x' * ((index * 31) % 13)}{index % 7}" for index in range(3000)]
+
+
+class SelectionOutputTest(unittest.TestCase):
+    """
+    Compares the top and bottom outputs with the first items of the sorted input.
+    Numbers are ranked by their value and words and lines by their length, the ones with the same length
+    in their input order, which is the order of a stable sort.
+    """
+    # The lines of each data type, with the name of its items, their separator in the output and their rank key.
+    inputs = {
+        "long": ([" ".join(NUMBERS[start:start + 5]) for start in range(0, len(NUMBERS), 5)], "number", " ", None),
+        "word": ([" ".join(WORDS[start:start + 5]) for start in range(0, len(WORDS), 5)], "word", " ", len),
+        "line": (WORDS, "line", "\n", len),
+    }
+    limits = (1, 10, 599, 3000, 3100)
+
+    def get_items(self, datatype:str) -> list:
+        lines = self.inputs[datatype][0]
+        if datatype == "line":
+            return lines
+        items = [item for line in lines for item in line.split()]
+        return [int(item) for item in items] if datatype == "long" else items
+
+    def get_expected(self, datatype:str, output:str, limit:int) -> str:
+        _, item_type, separator, key = self.inputs[datatype]
+        items = self.get_items(datatype)
+        selected = sorted(items, key=key, reverse=output == "top")[:limit]
+        title = "Top" if output == "top" else "Bottom"
+        return (f"Total {item_type}s: {len(items)}.\n{title} {len(selected)} {item_type}s:"
+                + "".join(f"{separator}{item}" for item in selected) + "\n")
+
+    def test_in_memory(self):
+        for datatype in self.inputs:
+            for output in ("top", "bottom"):
+                for limit in self.limits:
+                    with self.subTest(datatype=datatype, output=output, limit=limit):
+                        result = sort_items(self.inputs[datatype][0], datatype, output, ProcessorOptions(limit=limit),
+                                            diagnostics=io.StringIO())
+                        self.assertEqual(self.get_expected(datatype, output, limit), result)
+
+    def test_parallel_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for datatype in self.inputs:
+                input_path = os.path.join(directory, f"{datatype}.txt")
+                with open(input_path, "w", encoding="utf-8") as file:
+                    file.write("\n".join(self.inputs[datatype][0]) + "\n")
+                for output in ("top", "bottom"):
+                    for limit in self.limits:
+                        with self.subTest(datatype=datatype, output=output, limit=limit):
+                            options = ProcessorOptions(limit=limit, workers=2, batch_size=4096)
+                            processor = create_processor(datatype, output, input_path, options=options)
+                            stream = io.StringIO()
+                            processor.output_stream = stream
+                            processor.diagnostics = io.StringIO()
+                            processor.load_data()
+                            processor.write_data()
+                            self.assertEqual(self.get_expected(datatype, output, limit), stream.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from formats import BinaryReader
+from options import ProcessorOptions
+from server import SortClient, SortServer
+
+
+class SortServerTest(unittest.TestCase):
+    """
+    Runs jobs through a daemon listening on a temporary Unix socket.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, "sorting-tool.sock")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def request(self, header:dict, payload:bytes = None) -> str:
+        return self.request_bytes(header, payload).decode("utf-8")
+
+    def request_bytes(self, header:dict, payload:bytes = None) -> bytes:
+        output = io.BytesIO()
+        SortClient(self.socket_path).request(header, io.BytesIO(payload) if payload is not None else None, output)
+        return output.getvalue()
+
+    def run_requests(self, requests:list, options:ProcessorOptions = None, request = None) -> list:
+        async def run():
+            server = SortServer(self.socket_path, jobs=2, queue_size=2, options=options)
+            await server.start()
+            try:
+                loop = asyncio.get_running_loop()
+                return await asyncio.gather(
+                    *(loop.run_in_executor(None, request or self.request, *arguments) for arguments in requests))
+            finally:
+                await server.close()
+
+        return asyncio.run(run())
+
+    def test_jobs_of_many_clients(self):
+        requests = [({"dataType": "long", "sortingType": "natural"}, f"{index} 3 x\n1\n".encode())
+                    for index in range(8)]
+        results = self.run_requests(requests)
+        for index, result in enumerate(results):
+            expected_data = " ".join(str(number) for number in sorted([index, 3, 1]))
+            self.assertEqual(f"\"x\" is not a long. It will be skipped.\n"
+                             f"Total numbers: 3.\nSorted data: {expected_data}\n", result)
+
+    def test_input_file_and_limit(self):
+        input_path = os.path.join(self.directory.name, "input.txt")
+        with open(input_path, "w", encoding="utf-8") as file:
+            file.write("b a\nccc a\n")
+
+        header = {"dataType": "word", "sortingType": "top", "limit": 1, "inputFile": input_path}
+        result, = self.run_requests([(header,)])
+        self.assertEqual("Total words: 4.\nTop 1 words: ccc\n", result)
+
+    def test_failed_job_keeps_the_runner(self):
+        async def run():
+            server = SortServer(self.socket_path, jobs=1, queue_size=2)
+            await server.start()
+            try:
+                loop = asyncio.get_running_loop()
+                failed = await loop.run_in_executor(
+                    None, self.request, {"dataType": "word", "sortingType": "natural"}, b"\xff\xfe bad\n")
+                result = await asyncio.wait_for(loop.run_in_executor(
+                    None, self.request, {"dataType": "long", "sortingType": "natural"}, b"2 1\n"), 10)
+                return failed, result, all(not runner.done() for runner in server.runners)
+            finally:
+                await server.close()
+
+        failed, result, running = asyncio.run(run())
+        self.assertTrue(failed.startswith("The job failed: "))
+        self.assertEqual("Total numbers: 2.\nSorted data: 1 2\n", result)
+        self.assertTrue(running)
+
+    def test_large_streamed_payload(self):
+        numbers = [(index * 7919) % 100003 for index in range(200000)]
+        payload = "\n".join(map(str, numbers)).encode("utf-8")
+        result, = self.run_requests([({"dataType": "long", "sortingType": "summary"}, payload)])
+        self.assertEqual(f"Total numbers: {len(numbers)}.\nThe greatest number: {max(numbers)} "
+                         f"({numbers.count(max(numbers))} time(s), 0%).\n", result)
+
+    def test_npy_output(self):
+        header = {"dataType": "long", "sortingType": "natural"}
+        result, = self.run_requests([(header, b"3 -1\n2\n")], ProcessorOptions(output_format="npy"), self.request_bytes)
+        values = [value for block in BinaryReader(io.BytesIO(result), npy=True) for value in block]
+        self.assertEqual([-1, 2, 3], values)
+
+    def test_forwarded_options(self):
+        options = ProcessorOptions(memory_limit=64, unique=True)
+        header = SortClient.create_header("long", "natural", options)
+        self.assertEqual({"dataType": "long", "sortingType": "natural", "memoryLimit": 64, "unique": True}, header)
+        result, = self.run_requests([(header, b"3 1 3\n2 1\n")])
+        self.assertEqual("Total numbers: 5.\nSorted distinct data: 1 2 3\n", result)
+
+    def test_output_file(self):
+        output_path = os.path.join(self.directory.name, "output.txt")
+        header = SortClient.create_header("long", "natural", ProcessorOptions(), output_path=output_path)
+        result, = self.run_requests([(header, b"2 x 1\n")])
+        self.assertEqual("\"x\" is not a long. It will be skipped.\n", result)
+        with open(output_path, encoding="utf-8") as file:
+            self.assertEqual("Total numbers: 2.\nSorted data: 1 2\n", file.read())
+
+    def test_constructor_diagnostics(self):
+        result, = self.run_requests([({"dataType": "word", "sortingType": "percentiles"}, b"b a\n")])
+        self.assertTrue(result.startswith("The percentiles sorting type is only supported for the long data type.\n"))
+
+    def test_ignored_parameters(self):
+        parameters = ["-dataType", "-sortingType", "-unique", "-workers", "--client", "-indexFile"]
+        self.assertEqual(["-workers", "-indexFile"], SortClient.get_ignored_parameters(parameters))
+
+    def test_invalid_option(self):
+        result, = self.run_requests([({"dataType": "long", "sortingType": "natural", "memoryLimit": -1}, b"1")])
+        self.assertEqual("\"-1\" is not a valid value of memoryLimit.\n", result)
+
+    def test_invalid_job(self):
+        result, = self.run_requests([({"dataType": "float", "sortingType": "natural"}, b"1")])
+        self.assertEqual("\"float\" is not a valid data type.\n", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
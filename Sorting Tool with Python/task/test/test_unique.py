@@ -0,0 +1,65 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from api import create_processor, sort_items
+from external import ExternalSorter
+from options import ProcessorOptions
+
+
+class UniqueOutputTest(unittest.TestCase):
+    """
+    Compares the unique natural output with the distinct items of the plain natural output.
+    """
+    lines = [f"{(index * 7919) % 701} w{index % 37} w{index % 5}" for index in range(4000)]
+
+    def get_expected(self, datatype:str) -> list[str]:
+        total, data = sort_items(self.lines, datatype, diagnostics=io.StringIO()).split("\n", 1)
+        separator = "\n" if datatype == "line" else " "
+        items = data[len("Sorted data:"):].strip("\n").strip(" ").split(separator)
+        distinct = list(dict.fromkeys(items))
+        return [total, separator.join(["Sorted distinct data:"] + distinct)]
+
+    def get_unique(self, datatype:str, options:ProcessorOptions) -> list[str]:
+        total, data = sort_items(self.lines, datatype, options=options, diagnostics=io.StringIO()).split("\n", 1)
+        return [total, data.rstrip("\n")]
+
+    def test_in_memory_and_spilled(self):
+        for datatype in ("long", "word", "line"):
+            for options in (ProcessorOptions(unique=True), ProcessorOptions(unique=True, memory_limit=2048)):
+                with self.subTest(datatype=datatype, memory_limit=options.memory_limit):
+                    self.assertEqual(self.get_expected(datatype), self.get_unique(datatype, options))
+
+    def test_spilled_runs_hold_distinct_items(self):
+        sorter = ExternalSorter(200, str, int, unique=True)
+        for index in range(1000):
+            sorter.add(index % 7)
+        try:
+            self.assertTrue(sorter.runs)
+            self.assertEqual(1000, len(sorter))
+            for run in sorter.runs:
+                items = list(sorter.read_run(run))
+                self.assertEqual(sorted(set(items)), items)
+        finally:
+            sorter.close()
+
+    def test_processor_spills_unique_runs(self):
+        processor = create_processor("word", "natural", options=ProcessorOptions(unique=True, memory_limit=512))
+        processor.diagnostics = io.StringIO()
+        try:
+            processor.load_lines(self.lines)
+            self.assertTrue(processor.sorter.runs)
+            self.assertEqual(list(dict.fromkeys(sorted(" ".join(self.lines).split()))),
+                             list(processor.iter_sorted()))
+        finally:
+            processor.close()
+
+    def test_ignored_for_other_outputs(self):
+        messages = io.StringIO()
+        with redirect_stdout(messages):
+            result = sort_items(self.lines, "word", "byCount", ProcessorOptions(unique=True))
+        self.assertEqual(sort_items(self.lines, "word", "byCount"), result)
+        self.assertIn("-unique option only applies", messages.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
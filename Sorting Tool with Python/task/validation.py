@@ -5,7 +5,13 @@ class ProcessorOutputs:
     summary = "summary"
     sorted = "natural"
     sorted_count = "byCount"
-    valid_types = (summary, sorted, sorted_count)
+    top = "top"
+    bottom = "bottom"
+    by_length = "byLength"
+    percentiles = "percentiles"
+    valid_types = (summary, sorted, sorted_count, top, bottom, by_length, percentiles)
+    # The outputs that are only available for the integer data type.
+    integer_types = (percentiles,)
 
 
 class ProcessorTypes:
@@ -15,4 +21,34 @@ class ProcessorTypes:
     integer = "long"
     line = "line"
     word = "word"
-    valid_types = (integer, line, word)
\ No newline at end of file
+    valid_types = (integer, line, word)
+
+
+class ProcessorEngines:
+    """
+    Defines the engines available for processing integer data.
+    """
+    python = "python"
+    numpy = "numpy"
+    valid_types = (python, numpy)
+
+
+class ProcessorAlgorithms:
+    """
+    Defines the algorithms available for sorting integer data.
+    """
+    auto = "auto"
+    counting = "counting"
+    radix = "radix"
+    timsort = "timsort"
+    valid_types = (auto, counting, radix, timsort)
+
+
+class ProcessorFormats:
+    """
+    Defines the formats available for reading and writing integer data.
+    """
+    text = "text"
+    binary = "binary"
+    npy = "npy"
+    valid_types = (text, binary, npy)
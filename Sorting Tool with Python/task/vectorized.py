@@ -0,0 +1,194 @@
+from algorithms import is_narrow_range
+from frequency import FrequencyTable
+from validation import ProcessorAlgorithms
+
+# NumPy is imported by NumpyIntegerStore.is_available on first use, so the python engine does not pay its import.
+np = None
+
+
+class NumpyIntegerStore:
+    """
+    Stores integers in NumPy int64 arrays, so parsing, sorting and counting run vectorized.
+    Values that do not fit in 64 bits are kept aside as Python integers.
+    """
+    int64_min = -(1 << 63)
+    int64_max = (1 << 63) - 1
+    # Amount of numbers converted to Python integers at once when iterating.
+    chunk_size = 1 << 16
+
+    def __init__(self, unique:bool = False):
+        """
+        :param unique: Whether the repeated numbers are dropped, keeping only the distinct ones.
+        """
+        self.unique = unique
+        self.chunks = []
+        self.pending = []
+        self.overflow = []
+        self.values = None
+        self.count = 0
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Imports NumPy if it was not imported yet, checking whether it is installed.
+        """
+        global np
+        if np is None:
+            try:
+                import numpy as np
+            except ImportError:
+                return False
+        return True
+
+    @staticmethod
+    def parse(text:str):
+        """
+        Parses all the whitespace separated tokens of a text at once.
+        :return: An int64 array, or None if some token is not a valid long or does not fit in 64 bits.
+        """
+        try:
+            return np.array(text.split(), dtype=np.int64)
+        except (ValueError, OverflowError):
+            return None
+
+    def __len__(self):
+        """
+        Gets how many numbers were stored, including the repeated ones.
+        """
+        return self.count
+
+    def append(self, number:int):
+        if self.int64_min <= number <= self.int64_max:
+            self.pending.append(number)
+        else:
+            self.overflow.append(number)
+        self.count += 1
+
+    def extend(self, numbers):
+        for number in numbers:
+            self.append(number)
+
+    def append_array(self, numbers):
+        self.count += len(numbers)
+        if self.unique:
+            numbers = np.unique(numbers)
+        self.chunks.append(numbers)
+
+    @staticmethod
+    def from_values(values):
+        """
+        Views an array("q") of 64-bit values as an int64 array, without copying it.
+        """
+        return np.frombuffer(values, dtype=np.int64)
+
+    def get_values(self):
+        """
+        Joins all the stored int64 values into a single array.
+        """
+        if self.pending:
+            self.chunks.append(np.array(self.pending, dtype=np.int64))
+            self.pending = []
+        if self.values is None or self.chunks:
+            if self.values is not None:
+                self.chunks.insert(0, self.values)
+            self.values = np.concatenate(self.chunks) if self.chunks else np.empty(0, dtype=np.int64)
+            self.chunks = []
+        return self.values
+
+    def sort(self, algorithm:str = ProcessorAlgorithms.auto):
+        """
+        Sorts the values with one of the ProcessorAlgorithms.
+        The counting sort expands the np.bincount histogram of a narrow range of values.
+        The radix and timsort choices use NumPy's default sort, which is several times faster on int64
+        than its stable sort or a radix sort built from NumPy operations.
+        When unique, np.unique sorts the distinct values instead.
+        """
+        values = self.get_values()
+        if self.unique:
+            self.overflow = sorted(set(self.overflow))
+            self.values = np.unique(values)
+            return
+
+        self.overflow.sort()
+        if not len(values):
+            return
+
+        minimum, maximum = int(values.min()), int(values.max())
+        if algorithm == ProcessorAlgorithms.auto:
+            narrow = is_narrow_range(len(values), minimum, maximum)
+            algorithm = ProcessorAlgorithms.counting if narrow else ProcessorAlgorithms.timsort
+
+        if algorithm == ProcessorAlgorithms.counting and is_narrow_range(len(values), minimum, maximum):
+            histogram = np.bincount(values - minimum)
+            self.values = np.repeat(np.arange(minimum, maximum + 1, dtype=np.int64), histogram)
+        else:
+            self.values = np.sort(values)
+
+    def select(self, ranks:list[int]) -> list[int]:
+        """
+        Picks the numbers at some positions of the natural order with np.partition, without sorting all of them.
+        :param ranks: The 0-based positions of the numbers, in increasing order.
+        """
+        values = self.get_values()
+        below = sorted(number for number in self.overflow if number < 0)
+        above = sorted(number for number in self.overflow if number > 0)
+        inner = [rank - len(below) for rank in ranks if 0 <= rank - len(below) < len(values)]
+        partitioned = np.partition(values, inner) if inner else values
+        selected = []
+        for rank in ranks:
+            if rank < len(below):
+                selected.append(below[rank])
+            elif rank < len(below) + len(values):
+                selected.append(int(partitioned[rank - len(below)]))
+            else:
+                selected.append(above[rank - len(below) - len(values)])
+        return selected
+
+    def iter_chunks(self):
+        """
+        Iterates over the stored numbers in lists of Python integers.
+        After sort() the numbers come in natural order, since the values below the int64 range
+        are negative overflows and the values above it are positive ones.
+        """
+        values = self.get_values()
+        below = [number for number in self.overflow if number < 0]
+        above = [number for number in self.overflow if number > 0]
+        if below:
+            yield below
+        for start in range(0, len(values), self.chunk_size):
+            yield values[start:start + self.chunk_size].tolist()
+        if above:
+            yield above
+
+    def iter_little_endian(self):
+        """
+        Iterates over the int64 values as raw little-endian bytes, in large chunks.
+        The values that do not fit in 64 bits are not included.
+        """
+        values = self.get_values().astype("<i8", copy=False)
+        for start in range(0, len(values), self.chunk_size):
+            yield values[start:start + self.chunk_size].tobytes()
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def get_frequencies(self) -> FrequencyTable:
+        """
+        Counts the occurrences of each number with np.unique, registering them ordered by count and value.
+        """
+        values, counts = np.unique(self.get_values(), return_counts=True)
+        order = np.lexsort((values, counts))
+        table = FrequencyTable()
+        for value, count in zip(values[order].tolist(), counts[order].tolist()):
+            table.add(value, count)
+        table.add_all(self.overflow)
+        return table
+
+    @staticmethod
+    def get_array_max(numbers) -> tuple[int, int]:
+        """
+        Gets the greatest number of a non-empty int64 array and how many times it occurs.
+        """
+        maximum = numbers.max()
+        return int(maximum), int(np.count_nonzero(numbers == maximum))
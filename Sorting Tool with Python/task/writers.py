@@ -0,0 +1,77 @@
+class OutputSink:
+    """
+    Collects pieces of output and writes them to a text stream in large chunks.
+    """
+    buffer_size = 1 << 16
+
+    def __init__(self, stream, close_stream:bool = False, buffer_size:int = None, mirror = None):
+        """
+        :param stream: The text stream that receives the output, like sys.stdout or an open file.
+        :param close_stream: Whether the stream is closed together with the sink.
+        :param buffer_size: The amount of characters collected before they are written to the stream.
+        :param mirror: If defined, another text stream that receives a copy of the output.
+        """
+        self.stream = stream
+        self.mirror = mirror
+        self.close_stream = close_stream
+        self.buffer_size = buffer_size or self.buffer_size
+        self.pieces = []
+        self.size = 0
+
+    def write(self, text:str):
+        """
+        Writes a piece of output, without adding a new line at the end.
+        """
+        self.pieces.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def write_line(self, line:str):
+        """
+        Writes a line of output, including a new line at the end.
+        """
+        self.write(line)
+        self.write("\n")
+
+    def flush(self):
+        """
+        Writes all the collected pieces to the stream.
+        """
+        if not self.pieces:
+            return
+
+        text = "".join(self.pieces)
+        self.stream.write(text)
+        self.stream.flush()
+        if self.mirror:
+            self.mirror.write(text)
+        self.pieces = []
+        self.size = 0
+
+    @staticmethod
+    def accepts_bytes(stream) -> bool:
+        """
+        Checks if a text stream has a byte stream under it, like sys.stdout.buffer, so it can receive binary output.
+        """
+        return hasattr(stream, "buffer")
+
+    def write_bytes(self, data:bytes):
+        """
+        Writes binary output to the byte stream under the text stream, after the text collected so far.
+        :raises ValueError: If the text stream has no byte stream under it, like an io.StringIO.
+        """
+        if not self.accepts_bytes(self.stream):
+            raise ValueError("The binary output formats need a stream that accepts bytes.")
+
+        self.flush()
+        self.stream.buffer.write(data)
+        self.stream.buffer.flush()
+
+    def close(self):
+        """
+        Flushes the collected pieces and closes the stream if the sink owns it.
+        """
+        self.flush()
+        if self.close_stream:
+            self.stream.close()
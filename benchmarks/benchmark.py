@@ -0,0 +1,230 @@
+"""
+Benchmark suite for the sorting tool.
+
+Generates synthetic datasets of varying size, cardinality and skew, runs every data type and sorting type
+through main.py reading both the standard input and an -inputFile, and records the wall time, the throughput
+and the peak memory of each run. The results can be stored as a JSON baseline and later runs fail when they
+regress past a threshold against it.
+
+Examples:
+    python benchmarks/benchmark.py --update-baseline
+    python benchmarks/benchmark.py --sizes 10000 100000 --threshold 0.2
+"""
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# The suite lives outside the task directory, so main.py stays the only script there.
+TASK_DIRECTORY = os.path.join(os.path.dirname(BENCHMARKS_DIRECTORY), "Sorting Tool with Python", "task")
+MAIN_SCRIPT = os.path.join(TASK_DIRECTORY, "main.py")
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIRECTORY, "benchmark_baseline.json")
+
+sys.path.insert(0, TASK_DIRECTORY)
+from validation import ProcessorOutputs, ProcessorTypes
+
+CARDINALITIES = {"low": 100, "high": 1_000_000}
+SKEWS = ("uniform", "zipf")
+SOURCES = ("stdin", "file")
+
+
+class DatasetGenerator:
+    """
+    Generates reproducible synthetic inputs for each data type.
+    """
+    def __init__(self, seed:int):
+        self.seed = seed
+
+    def generate(self, datatype:str, size:int, cardinality:str, skew:str) -> str:
+        """
+        :param datatype: One of the ProcessorTypes.
+        :param size: The amount of tokens (numbers or words) in the dataset.
+        :param cardinality: One of the CARDINALITIES, bounding how many distinct tokens exist.
+        :param skew: "uniform" picks the tokens evenly, "zipf" makes a few tokens very frequent.
+        :return: The text of the dataset.
+        """
+        rng = random.Random(f"{self.seed}-{datatype}-{size}-{cardinality}-{skew}")
+        distinct = CARDINALITIES[cardinality]
+        indexes = self.pick_indexes(rng, size, distinct, skew)
+        if datatype == ProcessorTypes.integer:
+            offset = rng.randint(-distinct, 0)
+            tokens = [str(offset + index * 7919) for index in indexes]
+        else:
+            vocabulary = {}
+            tokens = [vocabulary.setdefault(index, self.make_word(index)) for index in indexes]
+
+        lines = []
+        position = 0
+        while position < len(tokens):
+            width = rng.randint(1, 12)
+            lines.append(" ".join(tokens[position:position + width]))
+            position += width
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def pick_indexes(rng:random.Random, size:int, distinct:int, skew:str) -> list[int]:
+        if skew == "uniform":
+            return [rng.randrange(distinct) for _ in range(size)]
+        # Zipf-like: the index is drawn from a Pareto distribution and folded into the range.
+        return [int(rng.paretovariate(1.2)) % distinct for _ in range(size)]
+
+    @staticmethod
+    def make_word(index:int) -> str:
+        letters = string.ascii_lowercase
+        word = []
+        index += 1
+        while index:
+            index, remainder = divmod(index, len(letters))
+            word.append(letters[remainder])
+        return "".join(word)
+
+
+class BenchmarkRunner:
+    """
+    Runs main.py for each benchmark case and measures it.
+    """
+    def __init__(self, extra_arguments:list[str], repeat:int):
+        """
+        :param extra_arguments: Arguments appended to every main.py run, like -engine numpy.
+        :param repeat: How many times each case runs; the fastest run is kept.
+        """
+        self.extra_arguments = extra_arguments
+        self.repeat = repeat
+
+    def run(self, datatype:str, output_type:str, source:str, dataset_path:str, size:int) -> dict:
+        arguments = [sys.executable, MAIN_SCRIPT, "-dataType", datatype, "-sortingType", output_type]
+        arguments += self.extra_arguments
+        if source == "file":
+            arguments += ["-inputFile", dataset_path]
+
+        best = None
+        for _ in range(self.repeat):
+            measure = self.measure(arguments, dataset_path if source == "stdin" else None)
+            if best is None or measure["wall_time"] < best["wall_time"]:
+                best = measure
+        best["throughput"] = size / best["wall_time"] if best["wall_time"] else 0.0
+        return best
+
+    @staticmethod
+    def measure(arguments:list[str], stdin_path:str | None) -> dict:
+        """
+        Runs a process and gets its wall time, in seconds, and its peak resident memory, in KiB.
+        """
+        stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+        try:
+            start = time.perf_counter()
+            process = subprocess.Popen(arguments, stdin=stdin, stdout=subprocess.DEVNULL, cwd=TASK_DIRECTORY)
+            _, status, usage = os.wait4(process.pid, 0)
+            wall_time = time.perf_counter() - start
+        finally:
+            if stdin_path:
+                stdin.close()
+        exit_code = os.waitstatus_to_exitcode(status)
+        process.returncode = exit_code
+        if exit_code:
+            raise RuntimeError(f"{' '.join(arguments)} exited with {exit_code}")
+        return {"wall_time": wall_time, "peak_memory_kb": usage.ru_maxrss}
+
+
+def is_supported(datatype:str, output_type:str) -> bool:
+    """
+    Checks if main.py can produce the output_type for the datatype, instead of only printing an error.
+    """
+    return datatype == ProcessorTypes.integer or output_type not in ProcessorOutputs.integer_types
+
+
+def compare(results:dict, baseline:dict, threshold:float) -> list[str]:
+    """
+    Finds the cases that got slower or used more memory than the baseline allows.
+    :return: A description of each regression.
+    """
+    regressions = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        for metric in ("wall_time", "peak_memory_kb"):
+            previous = baseline[case][metric]
+            if previous and result[metric] > previous * (1 + threshold):
+                change = (result[metric] / previous - 1) * 100
+                regressions.append(f"{case}: {metric} {previous:.4g} -> {result[metric]:.4g} ({change:+.0f}%)")
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Benchmarks every data type and sorting type of the sorting tool.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="amounts of tokens of the generated datasets")
+    parser.add_argument("--datatypes", nargs="+", default=list(ProcessorTypes.valid_types))
+    parser.add_argument("--sorting-types", nargs="+", default=list(ProcessorOutputs.valid_types))
+    parser.add_argument("--cardinalities", nargs="+", default=list(CARDINALITIES))
+    parser.add_argument("--skews", nargs="+", default=list(SKEWS))
+    parser.add_argument("--sources", nargs="+", default=list(SOURCES))
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, the fastest is kept")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="JSON file with the stored baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--output", help="JSON file where the results of this run are written")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative regression against the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument("--main-args", default="", help="extra arguments for main.py, e.g. \"-engine numpy\"")
+    return parser.parse_args()
+
+
+def main():
+    arguments = parse_arguments()
+    generator = DatasetGenerator(arguments.seed)
+    runner = BenchmarkRunner(arguments.main_args.split(), arguments.repeat)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for datatype in arguments.datatypes:
+            for size in arguments.sizes:
+                for cardinality in arguments.cardinalities:
+                    for skew in arguments.skews:
+                        dataset_path = os.path.join(directory, f"{datatype}-{size}-{cardinality}-{skew}.txt")
+                        with open(dataset_path, "w", encoding="utf-8") as file:
+                            file.write(generator.generate(datatype, size, cardinality, skew))
+
+                        for output_type in arguments.sorting_types:
+                            if not is_supported(datatype, output_type):
+                                continue
+                            for source in arguments.sources:
+                                case = f"{datatype}/{output_type}/{source}/{size}/{cardinality}/{skew}"
+                                results[case] = runner.run(datatype, output_type, source, dataset_path, size)
+                                result = results[case]
+                                print(f"{case:<50} {result['wall_time']:>9.3f} s "
+                                      f"{result['throughput']:>12.0f} items/s "
+                                      f"{result['peak_memory_kb'] / 1024:>8.1f} MiB")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Baseline stored in {arguments.baseline}.")
+        return
+
+    if not os.path.isfile(arguments.baseline):
+        print(f"There is no baseline in {arguments.baseline}. Use --update-baseline to store one.")
+        return
+
+    with open(arguments.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, arguments.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()